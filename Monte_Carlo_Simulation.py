@@ -2,14 +2,26 @@ import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.patches import Circle, Rectangle
 import time
+import os
+import sys
+import json
+import signal
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
-def estimate_pi(n):
+def estimate_pi(n, sampler='random', seed=None):
     """
     Estimate the value of π using Monte Carlo simulation with n random points.
+    sampler is 'random' (pseudo-random), 'sobol' or 'halton' (quasi-random).
     """
     # Generate n random points within [-1, 1] x [-1, 1]
-    x = np.random.uniform(-1, 1, n)
-    y = np.random.uniform(-1, 1, n)
+    if sampler == 'random' and seed is None:
+        x = np.random.uniform(-1, 1, n)
+        y = np.random.uniform(-1, 1, n)
+    else:
+        points = SAMPLERS[sampler](2, np.random.default_rng(seed)).random(n)
+        x = 2 * points[:, 0] - 1
+        y = 2 * points[:, 1] - 1
     
     # Calculate distance from origin for each point
     distances = x**2 + y**2
@@ -22,10 +34,844 @@ def estimate_pi(n):
     
     return pi_estimate, x, y, distances <= 1
 
-def plot_simulation(x, y, inside_circle, pi_estimate, n):
+class HaltonSampler:
+    """
+    Halton low-discrepancy points (one prime base per dimension), randomized
+    by a uniform shift modulo 1. Keeps its position, so successive calls to
+    random() continue the same sequence.
+    """
+    
+    PRIMES = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53]
+    
+    def __init__(self, dims=2, rng=None, scramble=True):
+        if dims > len(self.PRIMES):
+            raise ValueError(f"Halton sampler supports at most {len(self.PRIMES)} dimensions")
+        self.dims = dims
+        self.index = 0
+        rng = rng or np.random.default_rng()
+        self.shift = rng.random(dims) if scramble else np.zeros(dims)
+        
+    def random(self, m):
+        idx = np.arange(self.index, self.index + m, dtype=np.int64)
+        self.index += m
+        points = np.empty((m, self.dims))
+        for d in range(self.dims):
+            base = self.PRIMES[d]
+            values = np.zeros(m)
+            remaining = idx.copy()
+            scale = 1.0 / base
+            while remaining.any():
+                values += scale * (remaining % base)
+                remaining //= base
+                scale /= base
+            points[:, d] = values
+        points += self.shift
+        return points % 1.0
+
+class SobolSampler:
+    """
+    Two-dimensional Sobol points (van der Corput in base 2, then the
+    direction numbers of the primitive polynomial x + 1), randomized by a
+    random digital shift (XOR). Keeps its position between calls; the
+    sequence has 2^BITS distinct points, after which it would repeat.
+    """
+    
+    BITS = 32
+    
+    def __init__(self, dims=2, rng=None, scramble=True):
+        if dims > 2:
+            raise ValueError("Sobol sampler supports at most 2 dimensions; use Halton for more")
+        self.dims = dims
+        self.index = 0
+        
+        m = [1]
+        for _ in range(1, self.BITS):
+            m.append((m[-1] << 1) ^ m[-1])
+        directions = [[1 << (self.BITS - 1 - k) for k in range(self.BITS)],
+                      [m[k] << (self.BITS - 1 - k) for k in range(self.BITS)]]
+        self.directions = np.array(directions[:dims], dtype=np.uint64)
+        
+        rng = rng or np.random.default_rng()
+        self.shift = (rng.integers(0, 1 << self.BITS, dims, dtype=np.uint64) if scramble
+                      else np.zeros(dims, dtype=np.uint64))
+        
+    def random(self, m):
+        if self.index + m > 1 << self.BITS:
+            raise ValueError(f"Sobol sequence exhausted: only 2^{self.BITS} distinct points per replicate")
+        idx = np.arange(self.index, self.index + m, dtype=np.uint64)
+        self.index += m
+        points = np.empty((m, self.dims))
+        for d in range(self.dims):
+            values = np.full(m, self.shift[d], dtype=np.uint64)
+            for k in range(self.BITS):
+                bit = (idx >> np.uint64(k)) & np.uint64(1)
+                values ^= bit * self.directions[d, k]
+            points[:, d] = values / float(1 << self.BITS)
+        return points
+
+class PseudoRandomSampler:
+    """numpy Generator wrapped in the same interface as the QMC samplers"""
+    
+    def __init__(self, dims=2, rng=None, scramble=True):
+        self.dims = dims
+        self.rng = rng or np.random.default_rng()
+        
+    def random(self, m):
+        return self.rng.random((m, self.dims))
+
+SAMPLERS = {'random': PseudoRandomSampler, 'sobol': SobolSampler, 'halton': HaltonSampler}
+
+MAX_PLOT_POINTS = 10**7  # above this, single runs use the streaming estimator
+DEFAULT_CHUNK_SIZE = 1 << 20  # samples per chunk; 8 MB per float64 coordinate buffer
+
+_JIT_KERNEL = None
+
+def jit_kernel():
+    """
+    Compile (once) and return a numba kernel that draws and tests points one
+    at a time in registers, so no arrays are written at all. Returns None
+    when numba is not installed.
+    """
+    global _JIT_KERNEL
+    if _JIT_KERNEL is None:
+        try:
+            import numba
+        except ImportError:
+            return None
+        
+        @numba.njit(nogil=True, cache=True)
+        def count_hits_jit(n, rng):
+            hits = 0
+            for _ in range(n):
+                x = rng.random()
+                y = rng.random()
+                if x * x + y * y <= 1.0:
+                    hits += 1
+            return hits
+        
+        _JIT_KERNEL = count_hits_jit
+    return _JIT_KERNEL
+
+def count_hits(n, rng, chunk_size=DEFAULT_CHUNK_SIZE, dtype=np.float64, kernel='numpy'):
+    """
+    Count how many of n uniform points in the unit square fall inside the
+    quarter circle x^2 + y^2 <= 1 (by symmetry the same fraction as the full
+    circle in [-1, 1] x [-1, 1]). Points are drawn chunk by chunk into
+    preallocated buffers, so memory use does not depend on n.
+    
+    kernel is 'numpy' (in-place ufuncs on the chunk buffers), 'jit' (numba,
+    float64 only) or 'auto' (jit when numba is available).
+    """
+    if kernel != 'numpy':
+        jit = jit_kernel()
+        if jit is not None:
+            return int(jit(n, rng))
+        if kernel == 'jit':
+            raise ImportError("kernel='jit' requires numba")
+    
+    size = min(n, chunk_size)
+    x = np.empty(size, dtype=dtype)
+    y = np.empty(size, dtype=dtype)
+    inside = np.empty(size, dtype=bool)
+    
+    hits = 0
+    remaining = n
+    while remaining > 0:
+        m = min(remaining, size)
+        xs, ys, mask = x[:m], y[:m], inside[:m]
+        rng.random(out=xs, dtype=dtype)
+        rng.random(out=ys, dtype=dtype)
+        np.multiply(xs, xs, out=xs)
+        np.multiply(ys, ys, out=ys)
+        np.add(xs, ys, out=xs)
+        np.less_equal(xs, 1, out=mask)
+        hits += int(np.count_nonzero(mask))
+        remaining -= m
+    return hits
+
+def pi_from_hits(hits, n):
+    """π estimate and its standard error from a hit count"""
+    p = hits / n
+    return 4 * p, 4 * (p * (1 - p) / n) ** 0.5
+
+def estimate_pi_streaming(n, chunk_size=DEFAULT_CHUNK_SIZE, dtype=np.float64, seed=None, kernel='numpy'):
+    """
+    Estimate π from n random points without keeping them in memory.
+    dtype may be np.float32 to halve memory traffic.
+    
+    Returns the estimate and its standard error.
+    """
+    if n < 1 or chunk_size < 1:
+        raise ValueError(f"n and chunk_size must be at least 1 (n={n}, chunk_size={chunk_size})")
+    rng = np.random.default_rng(seed)
+    hits = count_hits(n, rng, chunk_size, dtype, kernel)
+    return pi_from_hits(hits, n)
+
+# Bytes of array memory read + written per sample by each kernel, counting
+# every ufunc pass over its inputs and output (itemsize s for coordinates,
+# 1 for boolean masks):
+#   estimate_pi: 2 generate (2s), x**2 and y**2 (4s), add (3s), two separate
+#                `<= 1` comparisons (2s + 2), sum over the mask (1)
+#   numpy:       2 generate (2s), in-place squares (4s), add (3s), one
+#                comparison (s + 1), count_nonzero (1)
+#   jit:         nothing; points never leave registers
+def _array_bytes_per_sample(kernel, itemsize):
+    if kernel == 'estimate_pi':
+        return 11 * itemsize + 3
+    if kernel == 'numpy':
+        return 10 * itemsize + 2
+    return 0
+
+def benchmark_kernels(n=10**7, repeats=3, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Compare the original estimate_pi against the chunked in-place kernel
+    (float64 and float32) and, if numba is installed, the JIT kernel.
+    Reports best-of-repeats samples/sec, array bytes moved per sample and
+    the peak memory allocated during one run (via tracemalloc).
+    """
+    import tracemalloc
+    
+    variants = [
+        ('estimate_pi', np.float64, lambda: estimate_pi(n)[0]),
+        ('numpy', np.float64, lambda: estimate_pi_streaming(n, chunk_size, np.float64, seed=0)[0]),
+        ('numpy', np.float32, lambda: estimate_pi_streaming(n, chunk_size, np.float32, seed=0)[0]),
+    ]
+    if jit_kernel() is not None:
+        estimate_pi_streaming(1000, kernel='jit')  # compile outside the timings
+        variants.append(('jit', np.float64, lambda: estimate_pi_streaming(n, seed=0, kernel='jit')[0]))
+    
+    results = []
+    for kernel, dtype, run in variants:
+        times = []
+        for _ in range(repeats):
+            start_time = time.perf_counter()
+            estimate = run()
+            times.append(time.perf_counter() - start_time)
+        
+        tracemalloc.start()
+        run()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        
+        rate = n / min(times)
+        bytes_per_sample = _array_bytes_per_sample(kernel, np.dtype(dtype).itemsize)
+        results.append({'kernel': kernel, 'dtype': np.dtype(dtype).name, 'samples_per_sec': rate,
+                        'bytes_per_sample': bytes_per_sample, 'gb_moved': bytes_per_sample * n / 1e9,
+                        'peak_mb': peak / 1e6, 'estimate': float(estimate)})
+        print(f"{kernel:>11} {np.dtype(dtype).name:>7}: {rate:>14,.0f} samples/sec, "
+              f"{bytes_per_sample:>3} B/sample ({bytes_per_sample * n / 1e9:.2f} GB), "
+              f"peak {peak / 1e6:8.1f} MB, π ≈ {estimate:.6f}")
+    return results
+
+def estimate_pi_qmc(n, sampler='sobol', replicates=8, chunk_size=DEFAULT_CHUNK_SIZE, seed=None):
+    """
+    Randomized quasi-Monte Carlo estimate of π: n points split across
+    independently scrambled replicates of a low-discrepancy sequence, each
+    generated in resumable blocks of chunk_size. The spread of the replicate
+    estimates gives the standard error (powers of two per replicate suit
+    Sobol best).
+    
+    Returns the estimate and its standard error.
+    """
+    if replicates < 2 or n < replicates:
+        raise ValueError(f"Need at least 2 replicates and one point per replicate (n={n}, replicates={replicates})")
+    # Spread any remainder so exactly n points are used
+    shares = [n // replicates + (1 if i < n % replicates else 0) for i in range(replicates)]
+    estimates = []
+    for seed_seq, per_replicate in zip(np.random.SeedSequence(seed).spawn(replicates), shares):
+        points = SAMPLERS[sampler](2, np.random.default_rng(seed_seq))
+        hits = 0
+        remaining = per_replicate
+        while remaining > 0:
+            block = points.random(min(remaining, chunk_size))
+            hits += int(np.count_nonzero(np.einsum('ij,ij->i', block, block) <= 1))
+            remaining -= len(block)
+        estimates.append(4 * hits / per_replicate)
+        
+    estimates = np.array(estimates)
+    return float(estimates.mean()), float(estimates.std(ddof=1) / np.sqrt(replicates))
+
+def _count_hits_task(n, seed_seq, chunk_size, dtype, kernel='numpy'):
+    return count_hits(n, np.random.default_rng(seed_seq), chunk_size, dtype, kernel)
+
+def estimate_pi_parallel(n, workers=None, backend='process', seed=None,
+                         chunk_size=DEFAULT_CHUNK_SIZE, dtype=np.float64, kernel='numpy'):
+    """
+    Estimate π with the sample budget split across a pool of workers.
+    Each worker gets its own stream from SeedSequence(seed).spawn(), so the
+    streams are statistically independent and a given (seed, workers)
+    pair always reproduces the same result. backend is 'process' or
+    'thread' (NumPy and the JIT kernel release the GIL while counting).
+    
+    Returns the estimate and its standard error.
+    """
+    workers = workers or os.cpu_count() or 1
+    if n < 1 or chunk_size < 1:
+        raise ValueError(f"n and chunk_size must be at least 1 (n={n}, chunk_size={chunk_size})")
+    seeds = np.random.SeedSequence(seed).spawn(workers)
+    shares = [n // workers + (1 if i < n % workers else 0) for i in range(workers)]
+    
+    if workers == 1:
+        hits = _count_hits_task(n, seeds[0], chunk_size, dtype, kernel)
+    else:
+        Executor = ProcessPoolExecutor if backend == 'process' else ThreadPoolExecutor
+        with Executor(max_workers=workers) as pool:
+            hits = sum(pool.map(_count_hits_task, shares, seeds, [chunk_size] * workers,
+                                [dtype] * workers, [kernel] * workers))
+    return pi_from_hits(hits, n)
+
+def benchmark_parallel_scaling(n=10**8, max_workers=None, backend='process'):
+    """Report samples/sec and speedup for 1 up to max_workers workers"""
+    max_workers = max_workers or os.cpu_count() or 1
+    results = []
+    
+    for workers in range(1, max_workers + 1):
+        start_time = time.perf_counter()
+        estimate, std_error = estimate_pi_parallel(n, workers, backend, seed=workers)
+        elapsed = time.perf_counter() - start_time
+        
+        rate = n / elapsed
+        speedup = rate / results[0]['samples_per_sec'] if results else 1.0
+        results.append({'workers': workers, 'seconds': elapsed, 'samples_per_sec': rate,
+                        'speedup': speedup, 'estimate': estimate, 'std_error': std_error})
+        print(f"{workers:>3} workers ({backend}): {elapsed:.3f} sec, {rate:,.0f} samples/sec, "
+              f"speedup {speedup:.2f}x, π ≈ {estimate:.6f} ± {std_error:.6f}")
+    return results
+
+class MonteCarloJob:
+    """
+    A long π estimation that checkpoints its progress (hits, samples done and
+    the exact bit generator state) to a JSON file, so an interrupted job can
+    be resumed with load() and finishes with the same result as an
+    uninterrupted run of the same seed.
+    """
+    
+    def __init__(self, path, n, seed=None, chunk_size=DEFAULT_CHUNK_SIZE, dtype=np.float64):
+        self.path = path
+        self.n = n
+        self.seed = np.random.SeedSequence(seed).entropy if seed is None else seed
+        self.chunk_size = chunk_size
+        self.dtype = np.dtype(dtype).name
+        self.rng = np.random.default_rng(self.seed)
+        self.samples_done = 0
+        self.hits = 0
+    
+    @classmethod
+    def load(cls, path):
+        """Restore a job from its checkpoint file"""
+        with open(path) as file:
+            state = json.load(file)
+        job = cls(path, state['n'], state['seed'], state['chunk_size'], state['dtype'])
+        job.samples_done = state['samples_done']
+        job.hits = state['hits']
+        job.rng.bit_generator.state = state['rng_state']
+        return job
+    
+    @property
+    def finished(self):
+        return self.samples_done >= self.n
+    
+    def save(self):
+        """Write the checkpoint atomically so a crash mid-write can't corrupt it"""
+        state = {'n': self.n, 'seed': self.seed, 'chunk_size': self.chunk_size, 'dtype': self.dtype,
+                 'samples_done': self.samples_done, 'hits': self.hits,
+                 'rng_state': self.rng.bit_generator.state}
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w') as file:
+            json.dump(state, file)
+        os.replace(temp_path, self.path)
+    
+    def run(self, checkpoint_interval=60.0, verbose=True):
+        """
+        Draw the remaining samples chunk by chunk, saving every
+        checkpoint_interval seconds and on completion. Ctrl+C or SIGTERM
+        stops at the next chunk boundary and saves the progress there, so
+        the saved RNG state always matches the saved hits and samples.
+        
+        Returns the estimate and its standard error, or None if interrupted.
+        """
+        stop_requested = []
+        
+        def on_signal(signum, frame):
+            stop_requested.append(signum)
+        
+        previous_handlers = {}
+        if threading.current_thread() is threading.main_thread():
+            for signum in (signal.SIGINT, signal.SIGTERM):
+                previous_handlers[signum] = signal.signal(signum, on_signal)
+        last_save = time.monotonic()
+        try:
+            # One chunk per step draws exactly the same stream as count_hits(n)
+            while not self.finished and not stop_requested:
+                rng_state = self.rng.bit_generator.state
+                m = min(self.n - self.samples_done, self.chunk_size)
+                try:
+                    hits = count_hits(m, self.rng, self.chunk_size, self.dtype)
+                except KeyboardInterrupt:
+                    # Raised outside our handlers: rewind the partly drawn chunk
+                    self.rng.bit_generator.state = rng_state
+                    stop_requested.append(signal.SIGINT)
+                    break
+                self.hits, self.samples_done = self.hits + hits, self.samples_done + m
+                if time.monotonic() - last_save >= checkpoint_interval:
+                    self.save()
+                    last_save = time.monotonic()
+                    if verbose:
+                        print(f"Checkpoint: {self.samples_done:,}/{self.n:,} samples "
+                              f"({100 * self.samples_done / self.n:.1f}%)")
+        finally:
+            for signum, handler in previous_handlers.items():
+                signal.signal(signum, handler)
+        
+        self.save()
+        if stop_requested and not self.finished:
+            if verbose:
+                print(f"Interrupted; progress saved to {self.path} "
+                      f"({self.samples_done:,}/{self.n:,} samples)")
+            return None
+        return pi_from_hits(self.hits, self.samples_done)
+
+def merge_jobs(paths):
+    """
+    Combine the hits and samples from several job checkpoints into one
+    estimate. Jobs must use different seeds, otherwise they repeat the same
+    points; finished and partial jobs can both be merged.
+    
+    Returns the estimate, its standard error and the total sample count.
+    """
+    hits = samples = 0
+    seeds = set()
+    for path in paths:
+        job = MonteCarloJob.load(path)
+        if job.seed in seeds:
+            raise ValueError(f"{path} repeats seed {job.seed} of another job")
+        seeds.add(job.seed)
+        hits += job.hits
+        samples += job.samples_done
+    if samples == 0:
+        raise ValueError("No samples to merge")
+    estimate, std_error = pi_from_hits(hits, samples)
+    return estimate, std_error, samples
+
+def run_job():
+    """Interactively start, resume or merge checkpointed jobs"""
+    action = input("Start a new job, resume one, or merge job files? (new/resume/merge): ").strip().lower()
+    try:
+        if action == 'new':
+            path = input("Checkpoint file (e.g., pi_job.json): ").strip() or 'pi_job.json'
+            n = int(float(input("Total number of points (e.g., 1e10): ")))
+            seed = input("Seed (leave blank for a random one): ").strip()
+            job = MonteCarloJob(path, n, int(seed) if seed else None)
+        elif action == 'resume':
+            job = MonteCarloJob.load(input("Checkpoint file to resume: ").strip())
+        elif action == 'merge':
+            paths = input("Job files to merge (separated by spaces): ").split()
+            estimate, std_error, samples = merge_jobs(paths)
+            print(f"Merged {len(paths)} jobs, {samples:,} samples: π ≈ {estimate:.8f} ± {std_error:.8f}")
+            return
+        else:
+            print("Invalid choice.")
+            return
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Could not set up the job: {e}")
+        return
+    
+    print(f"Running {job.n - job.samples_done:,} remaining samples (Ctrl+C to pause)...")
+    result = job.run()
+    if result:
+        print(f"Estimated π: {result[0]:.8f} ± {result[1]:.8f} (checkpoint in {job.path})")
+
+def _quarter_circle(u):
+    """4 * sqrt(1 - u^2): its mean over u ~ U(0, 1) is exactly π"""
+    return 4 * np.sqrt(1 - u * u)
+
+def _iid_stats(values):
+    return float(values.mean()), float(values.var(ddof=1)) / len(values)
+
+def _chunk_plain(rng, m):
+    x = rng.random(m)
+    y = rng.random(m)
+    return _iid_stats(4.0 * (x * x + y * y <= 1))
+
+def _chunk_antithetic(rng, m):
+    u = rng.random(max(m // 2, 2))
+    return _iid_stats(0.5 * (_quarter_circle(u) + _quarter_circle(1 - u)))
+
+def _chunk_stratified(rng, m):
+    # k x k grid over the unit square, two points per cell so each cell's
+    # variance can be estimated; only cells cut by the arc contribute any
+    k = max(int((m / 2) ** 0.5), 1)
+    cells = np.arange(k)
+    offsets_x = (cells[:, None] + rng.random((k, k, 2)).transpose(2, 0, 1)) / k
+    offsets_y = (cells[None, :] + rng.random((k, k, 2)).transpose(2, 0, 1)) / k
+    hits = 4.0 * (offsets_x ** 2 + offsets_y ** 2 <= 1)
+    cell_means = hits.mean(axis=0)
+    cell_vars = np.square(hits[0] - hits[1]) / 2
+    return float(cell_means.mean()), float(cell_vars.sum()) / 2 / k ** 4
+
+def _chunk_control(rng, m):
+    # Control variate u^2, whose mean 1/3 is known
+    u = rng.random(m)
+    g = _quarter_circle(u)
+    c = u * u
+    beta = np.cov(g, c)[0, 1] / c.var(ddof=1)
+    return _iid_stats(g - beta * (c - 1 / 3))
+
+def _chunk_importance(rng, m):
+    # Sample x from p(x) = (4 - 2x) / 3, which decreases like the integrand
+    x = 2 - np.sqrt(4 - 3 * rng.random(m))
+    return _iid_stats(_quarter_circle(x) * 3 / (4 - 2 * x))
+
+VARIANCE_REDUCTION = {
+    'plain': _chunk_plain,
+    'antithetic': _chunk_antithetic,
+    'stratified': _chunk_stratified,
+    'control': _chunk_control,
+    'importance': _chunk_importance,
+}
+
+def estimate_pi_variance_reduced(n, method='plain', chunk_size=DEFAULT_CHUNK_SIZE, seed=None):
+    """
+    Estimate π from n samples using a variance-reduction strategy:
+    
+    plain      -- hit-or-miss in the unit square (the baseline)
+    antithetic -- mean of 4*sqrt(1-u^2) over pairs u, 1-u
+    stratified -- hit-or-miss with points spread evenly over a grid of cells
+    control    -- 4*sqrt(1-u^2) with u^2 as a control variate
+    importance -- 4*sqrt(1-x^2) with x drawn from a density shaped like it
+    
+    Chunks are treated as independent estimates and combined by size.
+    Returns the estimate and its standard error.
+    """
+    if method not in VARIANCE_REDUCTION:
+        raise ValueError(f"Unknown method {method!r}; choose from {', '.join(VARIANCE_REDUCTION)}")
+        
+    chunk = VARIANCE_REDUCTION[method]
+    rng = np.random.default_rng(seed)
+    weighted_sum = weighted_var = 0.0
+    remaining = n
+    while remaining > 0:
+        m = min(remaining, chunk_size)
+        estimate, variance = chunk(rng, m)
+        weighted_sum += m * estimate
+        weighted_var += m * m * variance
+        remaining -= m
+    return weighted_sum / n, (weighted_var ** 0.5) / n
+
+def benchmark_variance_reduction(n=10**6, replicates=20, seed=0):
+    """
+    Compare variance-reduction methods at equal n: RMSE against π over
+    independent replicates, CPU time per run, and efficiency relative to
+    plain sampling (1 / (MSE * CPU seconds), higher is better).
+    """
+    seeds = np.random.SeedSequence(seed).spawn(replicates)
+    results = []
+    
+    for method in VARIANCE_REDUCTION:
+        start_cpu = time.process_time()
+        estimates = [estimate_pi_variance_reduced(n, method, seed=seq)[0] for seq in seeds]
+        cpu = (time.process_time() - start_cpu) / replicates
+        rmse = float(np.sqrt(np.mean((np.array(estimates) - np.pi) ** 2)))
+        results.append({'method': method, 'rmse': rmse, 'cpu_sec': cpu,
+                        'efficiency': 1 / (rmse ** 2 * cpu) if rmse > 0 and cpu > 0 else float('inf')})
+        
+    baseline = results[0]['efficiency']
+    for row in results:
+        row['relative_efficiency'] = row['efficiency'] / baseline
+        print(f"{row['method']:<11} RMSE {row['rmse']:.2e}  CPU {row['cpu_sec']:.4f} sec/run  "
+              f"efficiency x{row['relative_efficiency']:,.1f}")
+    return results
+
+BENCHMARK_VARIANTS = ('serial', 'chunked', 'parallel', 'qmc')
+
+def _peak_rss_bytes():
+    """Peak resident set size of this process and its finished children"""
+    import resource
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    scale = 1 if sys.platform == 'darwin' else 1024
+    return max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss) * scale
+
+def _run_variant(variant, n, dtype, workers, seed):
+    if variant == 'serial':
+        # Seed the global generator so the default np.random.uniform path is the one timed
+        np.random.seed(seed)
+        return float(estimate_pi(n)[0])
+    if variant == 'chunked':
+        return estimate_pi_streaming(n, dtype=dtype, seed=seed)[0]
+    if variant == 'parallel':
+        return estimate_pi_parallel(n, workers, seed=seed, dtype=dtype)[0]
+    return estimate_pi_qmc(n, seed=seed)[0]
+
+def _benchmark_case(variant, n, dtype, workers, warmup, repeats):
+    """Time one configuration; run in a fresh process so its peak RSS is its own"""
+    for i in range(warmup):
+        _run_variant(variant, min(n, 10**6), dtype, workers, seed=i)
+    times, errors = [], []
+    for i in range(repeats):
+        start_time = time.perf_counter()
+        estimate = _run_variant(variant, n, dtype, workers, seed=i)
+        times.append(time.perf_counter() - start_time)
+        errors.append(abs(estimate - np.pi))
+    return {'variant': variant, 'n': n, 'dtype': np.dtype(dtype).name, 'workers': workers,
+            'repeats': repeats, 'best_sec': min(times), 'median_sec': float(np.median(times)),
+            'samples_per_sec': n / float(np.median(times)), 'mean_abs_error': float(np.mean(errors)),
+            'peak_rss_mb': _peak_rss_bytes() / 1e6}
+
+def _git_commit():
+    try:
+        import subprocess
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_benchmark_suite(sizes=(10**6, 10**7), dtypes=(np.float64, np.float32), worker_counts=None,
+                        variants=BENCHMARK_VARIANTS, warmup=1, repeats=3, output='mc_benchmark'):
+    """
+    Benchmark the π estimators over a matrix of sizes, dtypes and worker
+    counts, and write the results to <output>.json (with machine and commit
+    metadata) and <output>.csv so runs can be compared across commits.
+    
+    dtype only applies to the chunked and parallel variants and workers
+    only to parallel; serial is skipped above MAX_PLOT_POINTS since it keeps
+    every point in memory.
+    """
+    worker_counts = worker_counts or sorted({1, os.cpu_count() or 1})
+    cases = []
+    for variant in variants:
+        for n in sizes:
+            if variant == 'serial' and n > MAX_PLOT_POINTS:
+                continue
+            for dtype in (dtypes if variant in ('chunked', 'parallel') else (np.float64,)):
+                for workers in (worker_counts if variant == 'parallel' else (1,)):
+                    cases.append((variant, n, dtype, workers))
+    
+    results = []
+    for variant, n, dtype, workers in cases:
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            row = pool.submit(_benchmark_case, variant, n, dtype, workers, warmup, repeats).result()
+        results.append(row)
+        print(f"{variant:>8} n={n:<11,} {row['dtype']:>7} workers={workers:<3} "
+              f"{row['samples_per_sec']:>14,.0f} samples/sec  peak RSS {row['peak_rss_mb']:8.1f} MB  "
+              f"error {row['mean_abs_error']:.2e}")
+    
+    import csv
+    import platform
+    report = {'commit': _git_commit(), 'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+              'python': platform.python_version(), 'numpy': np.__version__,
+              'platform': platform.platform(), 'cpu_count': os.cpu_count(),
+              'warmup': warmup, 'repeats': repeats, 'results': results}
+    with open(output + '.json', 'w') as file:
+        json.dump(report, file, indent=2)
+    with open(output + '.csv', 'w', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=list(results[0]))
+        writer.writeheader()
+        writer.writerows(results)
+    print(f"Results written to {output}.json and {output}.csv")
+    return report
+
+def make_integrand(func_str, variables='x'):
+    """
+    Build a vectorized integrand from an expression string such as
+    'exp(-x**2 - y**2)' using the same parser as Trapezoidal_Rule.
+    """
+    from Trapezoidal_Rule import parse_function
+    f, _ = parse_function(func_str, variables)
+    return f
+
+def _combine_moments(a, b):
+    """Merge (count, mean, sum of squared deviations) of two sample batches"""
+    n_a, mean_a, m2_a = a
+    n_b, mean_b, m2_b = b
+    n = n_a + n_b
+    delta = mean_b - mean_a
+    return n, mean_a + delta * n_b / n, m2_a + m2_b + delta * delta * n_a * n_b / n
+
+def _integrate_chunk(f, lower, upper, n, seed_seq, dtype):
+    """Evaluate f at n uniform points of the box and return the batch moments"""
+    rng = np.random.default_rng(seed_seq)
+    points = rng.random((len(lower), n), dtype=dtype)
+    points *= (upper - lower)[:, None]
+    points += lower[:, None]
+    values = np.broadcast_to(np.asarray(f(*points), dtype=np.float64), (n,))
+    mean = float(values.mean())
+    return n, mean, float(np.square(values - mean).sum())
+
+def mc_integrate(f, lower, upper, n=10**6, target_error=None, chunk_size=1 << 16,
+                 workers=1, backend='thread', seed=None, dtype=np.float64):
+    """
+    Monte Carlo integral of a vectorized function f(x1, ..., xd) over the box
+    lower <= x <= upper (scalars for 1-D, sequences for d dimensions).
+    
+    Samples are drawn in chunks of chunk_size, one chunk per worker per round,
+    and the running mean/variance is updated after every round. Sampling
+    stops after n samples, or earlier once the standard error drops to
+    target_error. Each chunk gets its own SeedSequence child, so results
+    depend only on seed and chunk_size, not on workers or backend. The
+    'process' backend needs f to be picklable (e.g. a module-level function).
+    
+    Returns a dict with the estimate, standard error, 95% confidence
+    interval, samples used and the (samples, estimate, std_error) history.
+    """
+    lower = np.atleast_1d(np.asarray(lower, dtype=np.float64))
+    upper = np.atleast_1d(np.asarray(upper, dtype=np.float64))
+    volume = float(np.prod(upper - lower))
+    root = np.random.SeedSequence(seed)
+    
+    moments = (0, 0.0, 0.0)
+    history = []
+    estimate = std_error = float('nan')
+    
+    pool = None
+    if workers > 1:
+        pool = (ProcessPoolExecutor if backend == 'process' else ThreadPoolExecutor)(max_workers=workers)
+    try:
+        while moments[0] < n:
+            sizes = []
+            for _ in range(workers):
+                size = min(chunk_size, n - moments[0] - sum(sizes))
+                if size > 0:
+                    sizes.append(size)
+            seeds = root.spawn(len(sizes))
+            
+            if pool:
+                futures = [pool.submit(_integrate_chunk, f, lower, upper, size, seed_seq, dtype)
+                           for size, seed_seq in zip(sizes, seeds)]
+                batches = [future.result() for future in futures]
+            else:
+                batches = [_integrate_chunk(f, lower, upper, size, seed_seq, dtype)
+                           for size, seed_seq in zip(sizes, seeds)]
+                
+            for batch in batches:
+                moments = batch if moments[0] == 0 else _combine_moments(moments, batch)
+                
+            count, mean, m2 = moments
+            estimate = volume * mean
+            std_error = volume * (m2 / (count - 1) / count) ** 0.5 if count > 1 else float('inf')
+            history.append((count, estimate, std_error))
+            
+            if target_error is not None and std_error <= target_error:
+                break
+    finally:
+        if pool:
+            pool.shutdown()
+            
+    return {
+        'estimate': estimate,
+        'std_error': std_error,
+        'ci95': (estimate - 1.96 * std_error, estimate + 1.96 * std_error),
+        'samples': moments[0],
+        'history': history
+    }
+
+SCATTER_LIMIT = 200000  # above this many points, plots are drawn as a density image
+
+def _accumulate_bins(counts, x, y, inside, bins):
+    """Add points in [-1, 1] x [-1, 1] to per-bin inside/outside counts"""
+    ix = np.minimum(((x + 1) * (bins / 2)).astype(np.intp), bins - 1)
+    iy = np.minimum(((y + 1) * (bins / 2)).astype(np.intp), bins - 1)
+    cell = iy * bins + ix
+    counts[0] += np.bincount(cell[inside], minlength=bins * bins)
+    counts[1] += np.bincount(cell[~inside], minlength=bins * bins)
+
+def simulate_density(n, bins=400, sample_size=20000, chunk_size=DEFAULT_CHUNK_SIZE, seed=None):
+    """
+    Run the simulation in chunks while binning every point into a bins x bins
+    inside/outside count grid and keeping a uniform reservoir sample of
+    sample_size points. Memory depends only on bins, sample_size and
+    chunk_size, never on n.
+    """
+    if n < 1 or bins < 1 or sample_size < 1 or chunk_size < 1:
+        raise ValueError(f"n, bins, sample_size and chunk_size must be at least 1 "
+                         f"(n={n}, bins={bins}, sample_size={sample_size}, chunk_size={chunk_size})")
+    rng = np.random.default_rng(seed)
+    counts = np.zeros((2, bins * bins), dtype=np.int64)
+    keys = np.empty(0)
+    sample = np.empty((0, 2))
+    hits = 0
+    
+    remaining = n
+    while remaining > 0:
+        m = min(remaining, chunk_size)
+        x = rng.uniform(-1, 1, m)
+        y = rng.uniform(-1, 1, m)
+        inside = x * x + y * y <= 1
+        hits += int(np.count_nonzero(inside))
+        _accumulate_bins(counts, x, y, inside, bins)
+        
+        # Reservoir by random keys: keep the sample_size smallest keys seen so far
+        chunk_keys = rng.random(m)
+        if len(keys) == sample_size:
+            candidates = np.flatnonzero(chunk_keys < keys.max())
+        else:
+            candidates = np.arange(m)
+        keys = np.concatenate([keys, chunk_keys[candidates]])
+        sample = np.concatenate([sample, np.column_stack([x[candidates], y[candidates]])])
+        if len(keys) > sample_size:
+            keep = np.argpartition(keys, sample_size)[:sample_size]
+            keys, sample = keys[keep], sample[keep]
+        remaining -= m
+        
+    estimate, std_error = pi_from_hits(hits, n)
+    return {'n': n, 'estimate': estimate, 'std_error': std_error, 'bins': bins,
+            'inside_counts': counts[0].reshape(bins, bins), 'outside_counts': counts[1].reshape(bins, bins),
+            'sample': sample}
+
+def plot_density(result, mode='density', filename=None):
+    """
+    Plot a simulate_density() result as a density image of inside (green)
+    and outside (red) points, or as a scatter of the reservoir sample when
+    mode is 'sample'. Saves to filename instead of showing when given.
+    """
+    fig = plt.figure(figsize=(10, 8))
+    ax = plt.gca()
+    
+    if mode == 'sample':
+        x, y = result['sample'][:, 0], result['sample'][:, 1]
+        inside = x * x + y * y <= 1
+        ax.scatter(x[inside], y[inside], color='green', s=2, alpha=0.6, label='Inside Circle (sample)')
+        ax.scatter(x[~inside], y[~inside], color='red', s=2, alpha=0.6, label='Outside Circle (sample)')
+        ax.legend()
+    else:
+        signed = result['inside_counts'] - result['outside_counts']
+        limit = max(np.abs(signed).max(), 1)
+        image = ax.imshow(signed, origin='lower', extent=(-1, 1, -1, 1), cmap='RdYlGn',
+                          vmin=-limit, vmax=limit, interpolation='nearest')
+        fig.colorbar(image, ax=ax, label='Points per bin (inside +, outside -)')
+        
+    ax.add_patch(Rectangle((-1, -1), 2, 2, fill=False, color='black', linewidth=2))
+    ax.add_patch(Circle((0, 0), 1, fill=False, color='blue', linewidth=2))
+    ax.set_aspect('equal')
+    ax.set_xlim(-1.1, 1.1)
+    ax.set_ylim(-1.1, 1.1)
+    ax.set_xlabel('x')
+    ax.set_ylabel('y')
+    ax.set_title(f"Monte Carlo Estimation of π using {result['n']} random points\n"
+                 f"Estimated π = {result['estimate']:.6f} ± {result['std_error']:.6f}")
+    
+    if filename:
+        fig.savefig(filename)
+        plt.close(fig)
+    else:
+        plt.show()
+
+def plot_simulation(x, y, inside_circle, pi_estimate, n, filename=None):
     """
     Plot the Monte Carlo simulation results.
     """
+    if n > SCATTER_LIMIT:
+        # Scattering every point is too slow; bin them into a density image
+        bins = 400
+        counts = np.zeros((2, bins * bins), dtype=np.int64)
+        for start in range(0, n, DEFAULT_CHUNK_SIZE):
+            chunk = slice(start, start + DEFAULT_CHUNK_SIZE)
+            _accumulate_bins(counts, x[chunk], y[chunk], inside_circle[chunk], bins)
+        plot_density({'n': n, 'estimate': pi_estimate, 'std_error': pi_from_hits(counts[0].sum(), n)[1],
+                      'bins': bins, 'inside_counts': counts[0].reshape(bins, bins),
+                      'outside_counts': counts[1].reshape(bins, bins)}, filename=filename)
+        return
+        
     plt.figure(figsize=(10, 8))
     
     # Plot square boundaries
@@ -49,9 +895,35 @@ def plot_simulation(x, y, inside_circle, pi_estimate, n):
     plt.xlim(-1.1, 1.1)
     plt.ylim(-1.1, 1.1)
     
-    plt.show()
+    if filename:
+        plt.savefig(filename)
+        plt.close()
+    else:
+        plt.show()
+
+def convergence_stream(checkpoints, sampler='random', chunk_size=DEFAULT_CHUNK_SIZE, seed=None):
+    """
+    Draw a single stream of points and report the cumulative π estimate at
+    each checkpoint N (ascending). Chunks are split at checkpoint boundaries
+    so each estimate uses exactly the first N points; 'elapsed' is the
+    perf_counter time from the start of the stream to that checkpoint.
+    """
+    points = SAMPLERS[sampler](2, np.random.default_rng(seed))
+    results = []
+    hits = done = 0
+    start_time = time.perf_counter()
+    
+    for target in sorted(checkpoints):
+        while done < target:
+            block = points.random(min(chunk_size, target - done))
+            hits += int(np.count_nonzero(np.einsum('ij,ij->i', block, block) <= 1))
+            done += len(block)
+        estimate, std_error = pi_from_hits(hits, done)
+        results.append({'n': done, 'estimate': estimate, 'std_error': std_error,
+                        'elapsed': time.perf_counter() - start_time})
+    return results
 
-def analyze_convergence():
+def analyze_convergence(sampler=None):
     """
     Analyze the convergence of the Monte Carlo estimation as N increases.
     """
@@ -60,20 +932,24 @@ def analyze_convergence():
     except ValueError:
         print("Invalid input. Using default value of 5.")
         max_power = 5
+        
+    if sampler is None:
+        sampler = input("Sampling method - random, sobol or halton (default: random): ").strip().lower() or 'random'
+        if sampler not in SAMPLERS:
+            print("Unknown sampling method. Using random.")
+            sampler = 'random'
     
     sample_sizes = [10**i for i in range(1, max_power+1)]
-    pi_estimates = []
-    execution_times = []
     
-    for n in sample_sizes:
-        start_time = time.time()
-        estimate, _, _, _ = estimate_pi(n)
-        end_time = time.time()
-        
-        pi_estimates.append(estimate)
-        execution_times.append(end_time - start_time)
-        
-        print(f"N = {n}, π estimate = {estimate:.6f}, Error = {abs(estimate - np.pi):.6f}, Time: {end_time - start_time:.4f} sec")
+    # One sample stream; every N is a prefix of the next, so the whole
+    # analysis costs about as much as the largest run alone
+    results = convergence_stream(sample_sizes, sampler)
+    pi_estimates = [row['estimate'] for row in results]
+    execution_times = [row['elapsed'] for row in results]
+    
+    for row in results:
+        print(f"N = {row['n']}, π estimate = {row['estimate']:.6f} ± {row['std_error']:.6f}, "
+              f"Error = {abs(row['estimate'] - np.pi):.6f}, Time to reach N: {row['elapsed']:.4f} sec")
     
     # Plot convergence
     plt.figure(figsize=(12, 6))
@@ -97,6 +973,30 @@ def analyze_convergence():
     plt.tight_layout()
     plt.show()
 
+def integrate_function():
+    """Interactively integrate a user-supplied function over a box"""
+    variables = input("Enter the variable names (default: x, e.g. 'x y' for 2-D): ").strip() or 'x'
+    func_str = input(f"Enter the function of {variables} to integrate (e.g., exp(-x**2)): ")
+    try:
+        f = make_integrand(func_str, variables)
+        lower, upper = [], []
+        for var in variables.replace(',', ' ').split():
+            lower.append(float(input(f"Lower bound for {var}: ")))
+            upper.append(float(input(f"Upper bound for {var}: ")))
+        target = input("Target standard error (leave blank to use the full budget): ")
+        target_error = float(target) if target else None
+    except Exception as e:
+        print(f"Invalid input: {e}")
+        return
+        
+    start_time = time.perf_counter()
+    result = mc_integrate(f, lower, upper, n=10**7, target_error=target_error, workers=os.cpu_count() or 1)
+    elapsed = time.perf_counter() - start_time
+    
+    low, high = result['ci95']
+    print(f"Integral ≈ {result['estimate']:.6f} ± {result['std_error']:.6f} "
+          f"(95% CI [{low:.6f}, {high:.6f}], {result['samples']} samples, {elapsed:.2f} sec)")
+
 def main():
     print("Monte Carlo Simulation for Estimating π")
     print("=======================================")
@@ -105,9 +1005,11 @@ def main():
         print("\nChoose an option:")
         print("1. Run a single simulation with N points")
         print("2. Analyze convergence with different sample sizes")
-        print("3. Exit")
+        print("3. Integrate a function with Monte Carlo")
+        print("4. Run, resume or merge checkpointed jobs")
+        print("5. Exit")
         
-        choice = input("Enter your choice (1-3): ")
+        choice = input("Enter your choice (1-5): ")
         
         if choice == '1':
             try:
@@ -120,6 +1022,22 @@ def main():
                 n = 1000
                 
             print(f"\nRunning simulation with {n} points...")
+            if n > MAX_PLOT_POINTS:
+                # Too many points to keep; stream them, binning for the plot if wanted
+                show_plot = input("Do you want to see the visualization? (y/n): ").lower()
+                if show_plot == 'y':
+                    result = simulate_density(n)
+                    pi_estimate, std_error = result['estimate'], result['std_error']
+                else:
+                    pi_estimate, std_error = estimate_pi_parallel(n)
+                print(f"Estimated π: {pi_estimate:.6f} ± {std_error:.6f}")
+                print(f"Actual π value: {np.pi:.6f}")
+                print(f"Absolute error: {abs(pi_estimate - np.pi):.6f}")
+                if show_plot == 'y':
+                    filename = input("Save plot to file (leave blank to display): ")
+                    plot_density(result, filename=filename or None)
+                continue
+                
             pi_estimate, x, y, inside_circle = estimate_pi(n)
             print(f"Estimated π: {pi_estimate:.6f}")
             print(f"Actual π value: {np.pi:.6f}")
@@ -133,11 +1051,32 @@ def main():
             analyze_convergence()
             
         elif choice == '3':
+            integrate_function()
+            
+        elif choice == '4':
+            run_job()
+            
+        elif choice == '5':
             print("Exiting program. Goodbye!")
             break
             
         else:
-            print("Invalid choice. Please enter 1, 2, or 3.")
+            print("Invalid choice. Please enter 1, 2, 3, 4, or 5.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if sys.argv[1:2] == ['bench']:
+        import argparse
+        parser = argparse.ArgumentParser(description="Benchmark the Monte Carlo π estimators")
+        parser.add_argument('command', choices=['bench'])
+        parser.add_argument('--sizes', type=float, nargs='+', default=[1e6, 1e7])
+        parser.add_argument('--dtypes', nargs='+', default=['float64', 'float32'])
+        parser.add_argument('--workers', type=int, nargs='+')
+        parser.add_argument('--variants', nargs='+', choices=BENCHMARK_VARIANTS, default=BENCHMARK_VARIANTS)
+        parser.add_argument('--warmup', type=int, default=1)
+        parser.add_argument('--repeats', type=int, default=3)
+        parser.add_argument('--output', default='mc_benchmark')
+        args = parser.parse_args()
+        run_benchmark_suite([int(n) for n in args.sizes], args.dtypes, args.workers, args.variants,
+                            args.warmup, args.repeats, args.output)
+    else:
+        main()
\ No newline at end of file
@@ -1,26 +1,300 @@
-import pandas as pd
-import matplotlib.pyplot as plt
-from IPython.display import display, clear_output
+import numpy as np
+import importlib
 import csv
 import os
+import bisect
+import io
+import random
+import time
+import multiprocessing
+import threading
+import functools
+import json
+import hashlib
+from collections import deque, Counter
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+
+class _LazyModule:
+    """Stand-in that imports the real module on first attribute access"""
+    
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+        
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+# pandas, matplotlib and IPython dominate import time and are only needed
+# for DataFrames, plots and notebook output, so load them on first use
+pd = _LazyModule('pandas')
+plt = _LazyModule('matplotlib.pyplot')
+
+def display(obj):
+    try:
+        from IPython.display import display as ipython_display
+    except ImportError:
+        print(obj)
+    else:
+        ipython_display(obj)
+
+def clear_output(wait=False):
+    try:
+        from IPython.display import clear_output as ipython_clear_output
+    except ImportError:
+        return
+    ipython_clear_output(wait=wait)
+
+# Event levels, ordered like the logging module's
+ERROR = 40
+WARNING = 30
+INFO = 20
+SILENT = 100
+
+class EventLog:
+    """
+    Buffered sink for SIS events. Every event is kept in a ring buffer of
+    recent events, counted per kind, passed to subscribed callbacks and
+    optionally appended to a JSON-lines audit file. Only events at or above
+    `verbosity` are echoed to stdout.
+    """
+    
+    def __init__(self, capacity=10000, verbosity=INFO, filename=None):
+        self.buffer = deque(maxlen=capacity)
+        self.verbosity = verbosity
+        self.counts = Counter()
+        self.callbacks = []
+        self.started = time.perf_counter()
+        self._file = open(filename, 'a', buffering=1 << 16) if filename else None
+        self._lock = threading.Lock()
+        
+    def emit(self, kind, message, level=INFO, **data):
+        event = {'time': time.time(), 'kind': kind, 'level': level, 'message': message, **data}
+        with self._lock:
+            self.buffer.append(event)
+            self.counts[kind] += 1
+            if self._file:
+                self._file.write(json.dumps(event, default=str) + "\n")
+        for callback in self.callbacks:
+            callback(event)
+        if level >= self.verbosity:
+            print(message)
+            
+    def subscribe(self, callback):
+        """Call callback(event) for every future event"""
+        self.callbacks.append(callback)
+        
+    @contextmanager
+    def quiet(self, verbosity=SILENT):
+        """Temporarily raise the echo threshold, e.g. for bulk operations"""
+        previous = self.verbosity
+        self.verbosity = max(previous, verbosity)
+        try:
+            yield self
+        finally:
+            self.verbosity = previous
+            
+    def recent(self, n=20, kind=None):
+        events = [e for e in self.buffer if kind is None or e['kind'] == kind]
+        return events[-n:]
+        
+    def stats(self):
+        """Event counts per kind and overall operations per second since creation/reset"""
+        elapsed = time.perf_counter() - self.started
+        total = sum(self.counts.values())
+        return {'events': dict(self.counts), 'total': total,
+                'ops_per_sec': total / elapsed if elapsed > 0 else 0.0}
+        
+    def reset_stats(self):
+        self.counts.clear()
+        self.started = time.perf_counter()
+        
+    def flush(self):
+        if self._file:
+            self._file.flush()
+            
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+# (minimum marks, letter, grade points), highest band first
+DEFAULT_SCALE = [(90, 'A', 4.0), (80, 'B', 3.0), (70, 'C', 2.0), (60, 'D', 1.0), (0, 'F', 0.0)]
+PLUS_MINUS_SCALE = [
+    (97, 'A+', 4.0), (93, 'A', 4.0), (90, 'A-', 3.7),
+    (87, 'B+', 3.3), (83, 'B', 3.0), (80, 'B-', 2.7),
+    (77, 'C+', 2.3), (73, 'C', 2.0), (70, 'C-', 1.7),
+    (67, 'D+', 1.3), (63, 'D', 1.0), (60, 'D-', 0.7),
+    (0, 'F', 0.0)
+]
+
+class RWLock:
+    """
+    Reader/writer lock: any number of concurrent readers or one writer.
+    Waiting writers are preferred so a stream of reads cannot starve them.
+    Both sides are re-entrant, and a thread holding the write lock may also
+    read; upgrading a read lock to a write lock is not allowed.
+    """
+    
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = None
+        self._writers_waiting = 0
+        self._local = threading.local()
+        
+    @contextmanager
+    def read(self):
+        if self._writer == threading.get_ident():
+            yield
+            return
+            
+        depth = getattr(self._local, 'reads', 0)
+        if depth == 0:
+            with self._cond:
+                while self._writer is not None or self._writers_waiting:
+                    self._cond.wait()
+                self._readers += 1
+        self._local.reads = depth + 1
+        try:
+            yield
+        finally:
+            self._local.reads -= 1
+            if self._local.reads == 0:
+                with self._cond:
+                    self._readers -= 1
+                    if self._readers == 0:
+                        self._cond.notify_all()
+                        
+    @contextmanager
+    def write(self):
+        me = threading.get_ident()
+        if self._writer == me:
+            # Re-entrant: the outermost write() releases the lock
+            yield
+            return
+            
+        if getattr(self._local, 'reads', 0):
+            raise RuntimeError("Cannot acquire the write lock while holding a read lock.")
+            
+        with self._cond:
+            self._writers_waiting += 1
+            while self._writer is not None or self._readers:
+                self._cond.wait()
+            self._writers_waiting -= 1
+            self._writer = me
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer = None
+                self._cond.notify_all()
+
+def _reads(method):
+    """Run a StudentInformationSystem method under its shared read lock"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock.read():
+            return method(self, *args, **kwargs)
+    return wrapper
+
+def _writes(method):
+    """Run a StudentInformationSystem method under its exclusive write lock"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock.write():
+            return method(self, *args, **kwargs)
+    return wrapper
+
+class GradingPolicy:
+    """
+    Letter scale, grade points and course credits used to grade marks.
+    Each scale is compiled into lookup tables over 0-100 in steps of 0.1,
+    so grading any number of marks is a single array index.
+    
+    scale         -- default list of (minimum marks, letter, points)
+    course_credits -- course: credit weight used for GPA (default 1)
+    level_scales  -- grade level: scale overriding the default for that level
+    """
+    
+    STEPS = 10  # table entries per mark; cutoffs must be multiples of 0.1
+    
+    def __init__(self, scale=None, course_credits=None, level_scales=None):
+        self.scale = list(scale or DEFAULT_SCALE)
+        self.course_credits = dict(course_credits or {})
+        self.level_scales = dict(level_scales or {})
+        self._default = self._compile(self.scale)
+        self._tables = {level: self._compile(level_scale) for level, level_scale in self.level_scales.items()}
+        
+    def _compile(self, scale):
+        bands = sorted(scale, key=lambda band: band[0], reverse=True)
+        if bands[-1][0] > 0:
+            raise ValueError("Grading scale must have a band starting at 0 marks.")
+            
+        grid = np.arange(100 * self.STEPS + 1)
+        letter_idx = np.zeros(len(grid), dtype=np.int8)
+        # Fill from the lowest band up so higher cutoffs overwrite
+        for i in range(len(bands) - 1, -1, -1):
+            letter_idx[grid >= round(bands[i][0] * self.STEPS)] = i
+            
+        return {
+            'letters': np.array([band[1] for band in bands], dtype=object),
+            'letter_idx': letter_idx,
+            'points': np.array([band[2] for band in bands])[letter_idx]
+        }
+        
+    def _table(self, grade_level=None):
+        return self._tables.get(grade_level, self._default)
+        
+    def _index(self, marks):
+        idx = np.floor(np.asarray(marks, dtype=float) * self.STEPS + 1e-9).astype(np.intp)
+        return np.clip(idx, 0, 100 * self.STEPS)
+        
+    def grade_points(self, marks, grade_level=None):
+        """Grade points for a scalar or array of marks"""
+        return self._table(grade_level)['points'][self._index(marks)]
+        
+    def letter_grades(self, marks, grade_level=None):
+        """Letter grades for a scalar or array of marks"""
+        table = self._table(grade_level)
+        return table['letters'][table['letter_idx'][self._index(marks)]]
+        
+    def credits(self, course):
+        return self.course_credits.get(course, 1.0)
+
+default_policy = GradingPolicy()
 
 class Student:
     
-    def __init__(self, student_id, name, age, grade_level, email=None):
+    def __init__(self, student_id, name, age, grade_level, email=None, policy=None):
         self.student_id = student_id
         self.name = name
         self.age = age
         self.grade_level = grade_level
         self.email = email
         self.courses = {}  # Dictionary to store course: marks
+        self.credits = {}  # course: credits overriding the policy default
+        self.policy = policy or default_policy
+        self._gpa = None  # Cached GPA, cleared whenever marks change
         
-    def add_course(self, course, marks):
+    def add_course(self, course, marks, credits=None):
+        """Add/update a course; credits overrides the policy's credits for it"""
         self.courses[course] = marks
+        if credits is not None:
+            self.credits[course] = credits
+        self._gpa = None
+        
+    def course_credits(self, course):
+        return self.credits.get(course, self.policy.credits(course))
         
     def remove_course(self, course):
         """Remove a course"""
         if course in self.courses:
             del self.courses[course]
+            self.credits.pop(course, None)
+            self._gpa = None
             return True
         return False
     
@@ -28,97 +302,413 @@ class Student:
         if not self.courses:
             return 0.0
             
-        total_points = 0
-        for course, marks in self.courses.items():
-            # Convert percentage to 4.0 scale
-            if marks >= 90:
-                points = 4.0  # A
-            elif marks >= 80:
-                points = 3.0  # B
-            elif marks >= 70:
-                points = 2.0  # C
-            elif marks >= 60:
-                points = 1.0  # D
-            else:
-                points = 0.0  # F
-            total_points += points
+        if self._gpa is None:
+            # Credit-weighted average of grade points on the 4.0 scale
+            points = self.policy.grade_points(list(self.courses.values()), self.grade_level)
+            credits = np.array([self.course_credits(course) for course in self.courses])
+            self._gpa = round(float(points @ credits / credits.sum()), 2)
             
-        return round(total_points / len(self.courses), 2)
+        return self._gpa
     
     def get_grade(self, course):
         
         if course not in self.courses:
             return "N/A"
         
-        marks = self.courses[course]
-        if marks >= 90:
-            return "A"
-        elif marks >= 80:
-            return "B"
-        elif marks >= 70:
-            return "C"
-        elif marks >= 60:
-            return "D"
-        else:
-            return "F"
+        return self.policy.letter_grades(self.courses[course], self.grade_level)
     
     def __str__(self):
         return f"Student ID: {self.student_id}, Name: {self.name}, Age: {self.age}, Grade Level: {self.grade_level}"
 
+class EnrollmentHistory:
+    """
+    Every (student, course, term) enrollment with its credits and marks,
+    stored as parallel NumPy columns. Credits are NaN unless given
+    explicitly, meaning "use the policy's credits for the course", so a
+    policy change re-weights them. Students, courses and terms are held
+    as integer codes. Re-taking a course in a later term adds a new row, so
+    history is never overwritten; cumulative GPA counts every attempt.
+    
+    Weighted grade-point sums are cached per term, and only terms touched
+    since the last query are re-reduced.
+    """
+    
+    def __init__(self, policy=None, capacity=1024):
+        self.policy = policy or default_policy
+        self.grade_levels = {}  # student_id: grade level, for per-level scales
+        self.size = 0
+        self.student = np.empty(capacity, dtype=np.int32)
+        self.course = np.empty(capacity, dtype=np.int32)
+        self.term = np.empty(capacity, dtype=np.int32)
+        self.credits = np.empty(capacity, dtype=np.float64)  # float64 so credits like 3.3 round-trip exactly
+        self.marks = np.empty(capacity, dtype=np.float64)
+        self.student_ids, self.course_names, self.term_names = [], [], []
+        self._codes = ({}, {}, {})  # student_id, course, term -> code
+        self._rows = {}  # (student code, course code, term code): row
+        self._term_sums = {}  # term code: (weighted points, credits) per student code
+        self._dirty = set()
+        self._refresh_lock = threading.Lock()  # concurrent readers may both refresh
+        
+    def _code(self, kind, key):
+        codes = self._codes[kind]
+        if key not in codes:
+            codes[key] = len(codes)
+            (self.student_ids, self.course_names, self.term_names)[kind].append(key)
+        return codes[key]
+        
+    def _grow(self):
+        for column in ('student', 'course', 'term', 'credits', 'marks'):
+            old = getattr(self, column)
+            new = np.empty(max(2 * len(old), 1024), dtype=old.dtype)
+            new[:self.size] = old[:self.size]
+            setattr(self, column, new)
+            
+    def record(self, student_id, course, term, marks, credits=None):
+        """Add an enrollment, or update its marks if already recorded for that term"""
+        key = (self._code(0, student_id), self._code(1, course), self._code(2, term))
+        row = self._rows.get(key)
+        if row is None:
+            if self.size == len(self.marks):
+                self._grow()
+            row = self._rows[key] = self.size
+            self.student[row], self.course[row], self.term[row] = key
+            self.credits[row] = np.nan
+            self.size += 1
+        if credits is not None:
+            self.credits[row] = credits
+        self.marks[row] = marks
+        self._dirty.add(key[2])
+        
+    def remove(self, student_id, course=None, term=None):
+        """Drop a student's enrollments, optionally only for one course and/or term"""
+        codes = self._codes
+        if student_id not in codes[0] or (course is not None and course not in codes[1]) \
+                or (term is not None and term not in codes[2]):
+            return 0
+            
+        n = self.size
+        drop = self.student[:n] == codes[0][student_id]
+        if course is not None:
+            drop &= self.course[:n] == codes[1][course]
+        if term is not None:
+            drop &= self.term[:n] == codes[2][term]
+            
+        removed = int(drop.sum())
+        if removed:
+            self._dirty.update(np.unique(self.term[:n][drop]).tolist())
+            keep = ~drop
+            for column in ('student', 'course', 'term', 'credits', 'marks'):
+                values = getattr(self, column)[:n][keep]
+                getattr(self, column)[:len(values)] = values
+            self.size = n - removed
+            self._rows = {key: row for row, key in enumerate(zip(self.student[:self.size].tolist(),
+                                                                 self.course[:self.size].tolist(),
+                                                                 self.term[:self.size].tolist()))}
+        return removed
+        
+    def set_policy(self, policy):
+        self.policy = policy
+        self.invalidate()
+        
+    def invalidate(self):
+        """Mark every term for recomputation"""
+        self._dirty.update(range(len(self.term_names)))
+        
+    def _credits(self, rows):
+        """Credits for rows, resolving the policy default where none were given"""
+        credits = self.credits[rows].astype(float)
+        default = np.isnan(credits)
+        if default.any():
+            policy_credits = np.array([self.policy.credits(name) for name in self.course_names])
+            credits[default] = policy_credits[self.course[rows][default]]
+        return credits
+        
+    def records(self, student_id):
+        """(term, course, marks, explicit credits or None) for each of a student's enrollments"""
+        code = self._codes[0].get(student_id)
+        if code is None:
+            return []
+        rows = np.flatnonzero(self.student[:self.size] == code)
+        return [(self.term_names[self.term[row]], self.course_names[self.course[row]], float(self.marks[row]),
+                 None if np.isnan(self.credits[row]) else float(self.credits[row])) for row in rows.tolist()]
+        
+    def _points(self, rows):
+        points = self.policy.grade_points(self.marks[rows])
+        if self.policy.level_scales:
+            levels = np.array([self.grade_levels.get(self.student_ids[code]) for code in self.student[rows].tolist()],
+                              dtype=object)
+            for level in self.policy.level_scales:
+                at_level = levels == level
+                points[at_level] = self.policy.grade_points(self.marks[rows][at_level], level)
+        return points
+        
+    def _refresh(self):
+        """Re-reduce only the terms that changed since the last query"""
+        with self._refresh_lock:
+            n_students = len(self.student_ids)
+            for term in self._dirty:
+                rows = np.flatnonzero(self.term[:self.size] == term)
+                owner = self.student[rows]
+                credits = self._credits(rows)
+                weighted = np.bincount(owner, weights=self._points(rows) * credits, minlength=n_students)
+                self._term_sums[term] = (weighted, np.bincount(owner, weights=credits, minlength=n_students))
+            self._dirty.clear()
+        
+    def _sums(self, term=None):
+        self._refresh()
+        n_students = len(self.student_ids)
+        weighted, credits = np.zeros(n_students), np.zeros(n_students)
+        terms = self._term_sums if term is None else {self._codes[2][term]: None}
+        for code in terms:
+            term_weighted, term_credits = self._term_sums[code]
+            weighted[:len(term_weighted)] += term_weighted
+            credits[:len(term_credits)] += term_credits
+        return weighted, credits
+        
+    def gpas(self, term=None):
+        """GPA of every student for one term, or cumulative over all terms when term is None"""
+        if term is not None and term not in self._codes[2]:
+            return {}
+        weighted, credits = self._sums(term)
+        gpas = np.divide(weighted, credits, out=np.zeros(len(weighted)), where=credits > 0)
+        return {self.student_ids[code]: round(float(gpas[code]), 2) for code in np.flatnonzero(credits > 0).tolist()}
+        
+    def gpa(self, student_id, term=None):
+        code = self._codes[0].get(student_id)
+        if code is None or (term is not None and term not in self._codes[2]):
+            return 0.0
+        weighted, credits = self._sums(term)
+        return round(float(weighted[code] / credits[code]), 2) if credits[code] > 0 else 0.0
+        
+    def to_dataframe(self, student_id=None):
+        n = self.size
+        rows = np.arange(n)
+        if student_id is not None:
+            if student_id not in self._codes[0]:
+                return pd.DataFrame()
+            rows = np.flatnonzero(self.student[:n] == self._codes[0][student_id])
+        return pd.DataFrame({
+            'Student ID': [self.student_ids[c] for c in self.student[rows].tolist()],
+            'Term': [self.term_names[c] for c in self.term[rows].tolist()],
+            'Course': [self.course_names[c] for c in self.course[rows].tolist()],
+            'Credits': self._credits(rows),
+            'Marks': self.marks[rows],
+            'Grade Points': self._points(rows)
+        })
+
+def _parse_number(value, cast=float):
+    if value is None or value == '':
+        return None
+    try:
+        return cast(float(value))
+    except ValueError:
+        return value
+
+def _content_record(name, age, grade_level, email, enrollments):
+    """
+    Normalise one student's data, including every (term, course, marks,
+    credits) enrollment, so equal content hashes equally wherever it came from
+    """
+    record = (str(name), _parse_number(age, int), str(grade_level), email or None,
+              sorted((str(term), str(course), _parse_number(marks), _parse_number(credits))
+                     for term, course, marks, credits in enrollments))
+    digest = hashlib.blake2b(json.dumps(record, default=str).encode(), digest_size=16).hexdigest()
+    return digest, record
+
+def snapshot_from_csv(filename, term='Current'):
+    """
+    Content snapshot of an exported CSV (student_id: (hash, record)), in the
+    same form as StudentInformationSystem.content_snapshot(), without
+    loading it into a system. Rows without a Term (older exports) belong to
+    `term`; blank Credits mean the policy default.
+    """
+    students = {}
+    with open(filename, newline='') as csvfile:
+        for row in csv.DictReader(csvfile):
+            student_id = _parse_number(row['Student ID'], int)
+            if student_id not in students:
+                students[student_id] = [row['Name'], row['Age'], row['Grade Level'], row.get('Email') or None, []]
+            if row.get('Course'):
+                students[student_id][4].append((row.get('Term') or term, row['Course'], row['Marks'],
+                                                row.get('Credits') or None))
+    return {student_id: _content_record(*fields) for student_id, fields in students.items()}
+
+def diff_snapshots(old, new):
+    """
+    Hash-join two content snapshots and return the student IDs to insert,
+    update and delete to turn old into new. O(N) dictionary lookups.
+    """
+    delta = {'insert': [], 'update': [], 'delete': []}
+    for student_id, (digest, _) in new.items():
+        previous = old.get(student_id)
+        if previous is None:
+            delta['insert'].append(student_id)
+        elif previous[0] != digest:
+            delta['update'].append(student_id)
+    delta['delete'] = [student_id for student_id in old if student_id not in new]
+    return delta
+
 class StudentInformationSystem:
     
     
     def __init__(self):
         self.students = {}  # Dictionary to store student_id: Student object
         self.courses = set()  # Set to track all available courses
+        self._rank_index = {}  # course (None for GPA): sorted list of scores
+        self.events = EventLog()
+        self.grading_policy = default_policy
+        self.history = EnrollmentHistory(self.grading_policy)
+        self.current_term = 'Current'  # Term that Student.courses reflects
+        self._lock = RWLock()
+        
+    def _move_score(self, course, old, new):
+        """
+        Keep a built rank index sorted in place when one score changes from
+        old to new (None meaning absent): O(log N) to find each position
+        instead of an O(N log N) rebuild on the next query.
+        """
+        scores = self._rank_index.get(course)
+        if scores is None or old == new:
+            return
+        if old is not None:
+            i = bisect.bisect_left(scores, old)
+            if i == len(scores) or scores[i] != old:
+                # Not where it should be (e.g. a NaN mark); rebuild on the next query
+                del self._rank_index[course]
+                return
+            del scores[i]
+        if new is not None:
+            if new != new:  # NaN can't be placed in sorted order
+                del self._rank_index[course]
+                return
+            bisect.insort(scores, new)
+        
+    def _ranked_gpa(self, student):
+        """Student's GPA if the GPA rank index is built (and needs updating), else None"""
+        return student.calculate_gpa() if None in self._rank_index else None
         
+    def _score(self, student, course=None):
+        if course is None:
+            return student.calculate_gpa()
+        return student.courses.get(course)
+        
+    def _get_rank_index(self, course=None):
+        """Build (once) the sorted scores for a course, or GPAs when course is None"""
+        if course not in self._rank_index:
+            scores = []
+            for student in self.students.values():
+                score = self._score(student, course)
+                if score is not None:
+                    scores.append(score)
+            scores.sort()
+            self._rank_index[course] = scores
+        return self._rank_index[course]
+        
+    @_writes
+    def set_grading_policy(self, policy):
+        """Switch grading policy and recompute every student's cached GPA in one pass"""
+        self.grading_policy = policy
+        self.history.set_policy(policy)
+        self._rank_index = {}
+        students = list(self.students.values())
+        if not students:
+            return
+            
+        counts = np.array([len(student.courses) for student in students])
+        owner = np.repeat(np.arange(len(students)), counts)
+        marks = np.fromiter((m for student in students for m in student.courses.values()), dtype=float, count=counts.sum())
+        credits = np.fromiter((student.credits.get(c, policy.credits(c)) for student in students for c in student.courses),
+                              dtype=float, count=counts.sum())
+        
+        if policy.level_scales:
+            row_levels = np.repeat(np.array([student.grade_level for student in students], dtype=object), counts)
+            points = policy.grade_points(marks)
+            for level in policy.level_scales:
+                rows = row_levels == level
+                points[rows] = policy.grade_points(marks[rows], level)
+        else:
+            points = policy.grade_points(marks)
+            
+        weighted = np.bincount(owner, weights=points * credits, minlength=len(students))
+        total_credits = np.bincount(owner, weights=credits, minlength=len(students))
+        gpas = np.divide(weighted, total_credits, out=np.zeros(len(students)), where=total_credits > 0)
+        
+        for student, gpa in zip(students, gpas.tolist()):
+            student.policy = policy
+            student._gpa = round(gpa, 2)
+            
+        self.events.emit('policy_changed', f"Grading policy updated; recomputed GPA for {len(students)} students.",
+                         students=len(students))
+        
+    @_writes
     def add_student(self, student_id, name, age, grade_level, email=None):
         
         if student_id in self.students:
-            print(f"Student with ID {student_id} already exists.")
+            self.events.emit('duplicate_student', f"Student with ID {student_id} already exists.", WARNING, student_id=student_id)
             return False
         
-        self.students[student_id] = Student(student_id, name, age, grade_level, email)
-        print(f"Student {name} added successfully with ID {student_id}.")
+        student = self.students[student_id] = Student(student_id, name, age, grade_level, email, self.grading_policy)
+        self.history.grade_levels[student_id] = grade_level
+        self._move_score(None, None, self._ranked_gpa(student))
+        self.events.emit('student_added', f"Student {name} added successfully with ID {student_id}.", student_id=student_id)
         return True
         
+    @_writes
     def update_student(self, student_id, **kwargs):
     
         if student_id not in self.students:
-            print(f"Student with ID {student_id} not found.")
+            self.events.emit('not_found', f"Student with ID {student_id} not found.", WARNING, student_id=student_id)
             return False
         
         student = self.students[student_id]
+        old_gpa = self._ranked_gpa(student)
         
         for key, value in kwargs.items():
             if key in ['name', 'age', 'grade_level', 'email']:
                 setattr(student, key, value)
                 
-        print(f"Student with ID {student_id} updated successfully.")
+        if 'grade_level' in kwargs:
+            # Grade level can select a different grading scale
+            student._gpa = None
+            self._move_score(None, old_gpa, self._ranked_gpa(student))
+            self.history.grade_levels[student_id] = student.grade_level
+            if self.grading_policy.level_scales:
+                self.history.invalidate()
+                
+        self.events.emit('student_updated', f"Student with ID {student_id} updated successfully.", student_id=student_id, fields=list(kwargs))
         return True
         
+    @_writes
     def delete_student(self, student_id):
         
         if student_id not in self.students:
-            print(f"Student with ID {student_id} not found.")
+            self.events.emit('not_found', f"Student with ID {student_id} not found.", WARNING, student_id=student_id)
             return False
         
+        student = self.students[student_id]
+        self._move_score(None, self._ranked_gpa(student), None)
+        for course, marks in student.courses.items():
+            self._move_score(course, marks, None)
+        self.history.remove(student_id)
+        self.history.grade_levels.pop(student_id, None)
         del self.students[student_id]
-        print(f"Student with ID {student_id} deleted successfully.")
+        self.events.emit('student_deleted', f"Student with ID {student_id} deleted successfully.", student_id=student_id)
         return True
         
+    @_reads
     def get_student(self, student_id):
         
         if student_id not in self.students:
-            print(f"Student with ID {student_id} not found.")
+            self.events.emit('not_found', f"Student with ID {student_id} not found.", WARNING, student_id=student_id)
             return None
         
         return self.students[student_id]
         
+    @_reads
     def list_all_students(self):
         
         if not self.students:
-            print("No students in the system.")
+            self.events.emit('no_data', "No students in the system.", WARNING)
             return pd.DataFrame()
         
         student_data = []
@@ -136,42 +726,80 @@ class StudentInformationSystem:
             
         return pd.DataFrame(student_data)
         
-    def add_course_marks(self, student_id, course, marks):
-        
+    @_writes
+    def add_course_marks(self, student_id, course, marks, term=None, credits=None):
+        """
+        Record marks for a course in a term (the current term by default).
+        Only current-term marks update the student's course list; every term
+        is kept in the enrollment history.
+        """
         if student_id not in self.students:
-            print(f"Student with ID {student_id} not found.")
+            self.events.emit('not_found', f"Student with ID {student_id} not found.", WARNING, student_id=student_id)
             return False
         
+        term = self.current_term if term is None else term
         student = self.students[student_id]
-        student.add_course(course, marks)
+        self.history.record(student_id, course, term, marks, credits)
+        if term == self.current_term:
+            old_marks, old_gpa = student.courses.get(course), self._ranked_gpa(student)
+            student.add_course(course, marks, credits)
+            self._move_score(course, old_marks, marks)
+            self._move_score(None, old_gpa, self._ranked_gpa(student))
         self.courses.add(course)
-        print(f"Marks for {course} added/updated for student {student.name}.")
+        self.events.emit('marks_updated', f"Marks for {course} added/updated for student {student.name}.", student_id=student_id, course=course, marks=marks, term=term)
         return True
         
+    @_reads
+    def get_term_gpa(self, student_id, term=None):
+        """Credit-weighted GPA for one term, or cumulative over all terms when term is None"""
+        if student_id not in self.students:
+            self.events.emit('not_found', f"Student with ID {student_id} not found.", WARNING, student_id=student_id)
+            return None
+        
+        if term == self.current_term:
+            # The current term is what Student.courses holds; keep one source for its GPA
+            return self.students[student_id].calculate_gpa()
+        return self.history.gpa(student_id, term)
+        
+    @_reads
+    def get_transcript(self, student_id):
+        """Every enrollment of a student across terms, including retaken courses"""
+        if student_id not in self.students:
+            self.events.emit('not_found', f"Student with ID {student_id} not found.", WARNING, student_id=student_id)
+            return None
+        
+        return self.history.to_dataframe(student_id)
+        
+    @_writes
     def remove_course(self, student_id, course):
         
         if student_id not in self.students:
-            print(f"Student with ID {student_id} not found.")
+            self.events.emit('not_found', f"Student with ID {student_id} not found.", WARNING, student_id=student_id)
             return False
         
         student = self.students[student_id]
+        old_marks, old_gpa = student.courses.get(course), self._ranked_gpa(student)
         if student.remove_course(course):
-            print(f"Course {course} removed for student {student.name}.")
+            self._move_score(course, old_marks, None)
+            self._move_score(None, old_gpa, self._ranked_gpa(student))
+            self.history.remove(student_id, course, self.current_term)
+            self.events.emit('course_removed', f"Course {course} removed for student {student.name}.", student_id=student_id, course=course)
             return True
         else:
-            print(f"Course {course} not found for student {student.name}.")
+            self.events.emit('not_found', f"Course {course} not found for student {student.name}.", WARNING, student_id=student_id, course=course)
             return False
             
+    @_reads
     def get_performance_summary(self, student_id=None):
     
         if student_id:
             if student_id not in self.students:
-                print(f"Student with ID {student_id} not found.")
+                self.events.emit('not_found', f"Student with ID {student_id} not found.", WARNING, student_id=student_id)
                 return None
             
             student = self.students[student_id]
             if not student.courses:
-                print(f"No courses found for student {student.name}.")
+                self.events.emit('no_data', f"No courses found for student {student.name}.", WARNING, student_id=student_id)
                 return None
                 
             course_data = []
@@ -186,7 +814,7 @@ class StudentInformationSystem:
         else:
             
             if not self.students:
-                print("No students in the system.")
+                self.events.emit('no_data', "No students in the system.", WARNING)
                 return None
                 
             all_data = []
@@ -201,15 +829,16 @@ class StudentInformationSystem:
                     })
                     
             if not all_data:
-                print("No course data found for any student.")
+                self.events.emit('no_data', "No course data found for any student.", WARNING)
                 return None
                 
             return pd.DataFrame(all_data)
             
+    @_reads
     def find_class_topper(self, course=None):
         
         if not self.students:
-            print("No students in the system.")
+            self.events.emit('no_data', "No students in the system.", WARNING)
             return None
             
         if course:
@@ -219,11 +848,11 @@ class StudentInformationSystem:
                     course_students.append((student, student.courses[course]))
                     
             if not course_students:
-                print(f"No students found for course {course}.")
+                self.events.emit('no_data', f"No students found for course {course}.", WARNING, course=course)
                 return None
                 
             topper = max(course_students, key=lambda x: x[1])
-            print(f"Class topper for {course}: {topper[0].name} with marks {topper[1]}")
+            self.events.emit('query', f"Class topper for {course}: {topper[0].name} with marks {topper[1]}")
             
             return {
                 'Student ID': topper[0].student_id,
@@ -238,11 +867,11 @@ class StudentInformationSystem:
                 gpa_students.append((student, gpa))
                 
             if not gpa_students:
-                print("No GPA data available.")
+                self.events.emit('no_data', "No GPA data available.", WARNING)
                 return None
                 
             topper = max(gpa_students, key=lambda x: x[1])
-            print(f"Overall topper: {topper[0].name} with GPA {topper[1]}")
+            self.events.emit('query', f"Overall topper: {topper[0].name} with GPA {topper[1]}")
             
             return {
                 'Student ID': topper[0].student_id,
@@ -250,79 +879,187 @@ class StudentInformationSystem:
                 'GPA': topper[1]
             }
             
-    def visualize_performance(self, course=None):
-        plt.figure(figsize=(12, 6))
+    @_reads
+    def rank(self, student_id, course=None):
+        """
+        Return the class rank (1 = best) of a student in a course, or by GPA
+        when no course is given. Tied scores share the same rank.
+        """
+        if student_id not in self.students:
+            self.events.emit('not_found', f"Student with ID {student_id} not found.", WARNING, student_id=student_id)
+            return None
+        
+        score = self._score(self.students[student_id], course)
+        if score is None:
+            self.events.emit('not_found', f"Course {course} not found for student {self.students[student_id].name}.", WARNING, student_id=student_id, course=course)
+            return None
+        
+        scores = self._get_rank_index(course)
+        # Everyone scoring strictly higher is ranked ahead
+        return len(scores) - bisect.bisect_right(scores, score) + 1
         
+    @_reads
+    def percentile(self, student_id, course=None):
+        """
+        Return the percentile rank (0-100) of a student in a course, or by GPA
+        when no course is given: the share of the class scoring below the
+        student, counting ties as half.
+        """
+        if student_id not in self.students:
+            self.events.emit('not_found', f"Student with ID {student_id} not found.", WARNING, student_id=student_id)
+            return None
+        
+        score = self._score(self.students[student_id], course)
+        if score is None:
+            self.events.emit('not_found', f"Course {course} not found for student {self.students[student_id].name}.", WARNING, student_id=student_id, course=course)
+            return None
+        
+        scores = self._get_rank_index(course)
+        below = bisect.bisect_left(scores, score)
+        ties = bisect.bisect_right(scores, score) - below
+        return round(100.0 * (below + 0.5 * ties) / len(scores), 2)
+        
+    @_reads
+    def get_rank_table(self, course=None):
+        """Rank and percentile columns for the whole class in one pass, for report cards"""
         if course:
-            # Visualize performance for a specific course
-            course_data = []
+            rows = [{'Student ID': student.student_id, 'Name': student.name, 'Marks': student.courses[course]}
+                    for student in self.students.values() if course in student.courses]
+            score_col = 'Marks'
+        else:
+            rows = [{'Student ID': student.student_id, 'Name': student.name, 'GPA': student.calculate_gpa()}
+                    for student in self.students.values()]
+            score_col = 'GPA'
+            
+        if not rows:
+            self.events.emit('no_data', "No data available for ranking.", WARNING)
+            return pd.DataFrame()
+            
+        df = pd.DataFrame(rows)
+        scores = df[score_col]
+        df['Rank'] = scores.rank(method='min', ascending=False).astype(int)
+        below = scores.rank(method='min') - 1
+        ties = scores.rank(method='max') - below
+        df['Percentile'] = (100.0 * (below + 0.5 * ties) / len(df)).round(2)
+        return df.sort_values('Rank').reset_index(drop=True)
+            
+    @_reads
+    def _performance_data(self, course=None):
+        """Names and scores to plot, plus marks per course for the box plot, copied under the read lock"""
+        if course:
+            names, scores = [], []
             for student in self.students.values():
                 if course in student.courses:
-                    course_data.append({
-                        'Student': student.name,
-                        'Marks': student.courses[course]
-                    })
-                    
-            if not course_data:
-                print(f"No data available for course {course}.")
+                    names.append(student.name)
+                    scores.append(student.courses[course])
+        else:
+            names = [student.name for student in self.students.values()]
+            scores = [student.calculate_gpa() for student in self.students.values()]
+            
+        course_marks = {c: [] for c in ([course] if course else sorted(self.courses))}
+        for student in self.students.values():
+            for c, marks in student.courses.items():
+                if c in course_marks:
+                    course_marks[c].append(marks)
+        return names, scores, course_marks
+        
+    def visualize_performance(self, course=None, filename=None, max_bars=50, top_n=10):
+        """
+        Plot marks for a course, or GPAs for the whole class. Classes larger
+        than max_bars are drawn as a histogram, a box plot per course and the
+        top_n/bottom_n bars instead of one bar per student. When filename is
+        given the figure is saved there without opening a window.
+        
+        The data is copied under the read lock and drawn after releasing it,
+        so an open plot window doesn't block writers.
+        """
+        names, scores, course_marks = self._performance_data(course)
+        if course:
+            if not scores:
+                self.events.emit('no_data', f"No data available for course {course}.", WARNING, course=course)
                 return
                 
-            course_df = pd.DataFrame(course_data)
-            plt.bar(course_df['Student'], course_df['Marks'], color='skyblue')
-            plt.xlabel('Students')
-            plt.ylabel('Marks')
-            plt.title(f'Student Performance in {course}')
-            plt.xticks(rotation=45)
-            plt.ylim(0, 100)
-            
-            for i, v in enumerate(course_df['Marks']):
-                plt.text(i, v + 2, str(v), ha='center')
-                
-            plt.tight_layout()
-            plt.show()
+            label, limit, color = 'Marks', 100, 'skyblue'
+            title = f'Student Performance in {course}'
         else:
-            # Visualize overall GPA
-            gpa_data = []
-            for student in self.students.values():
-                gpa = student.calculate_gpa()
-                gpa_data.append({
-                    'Student': student.name,
-                    'GPA': gpa
-                })
-                
-            if not gpa_data:
-                print("No GPA data available.")
+            if not scores:
+                self.events.emit('no_data', "No GPA data available.", WARNING)
                 return
                 
-            gpa_df = pd.DataFrame(gpa_data)
-            plt.bar(gpa_df['Student'], gpa_df['GPA'], color='lightgreen')
-            plt.xlabel('Students')
-            plt.ylabel('GPA')
-            plt.title('Student GPA Comparison')
-            plt.xticks(rotation=45)
-            plt.ylim(0, 4.0)
-            
-            for i, v in enumerate(gpa_df['GPA']):
-                plt.text(i, v + 0.1, str(v), ha='center')
-                
-            plt.tight_layout()
-            plt.show()
+            label, limit, color = 'GPA', 4.0, 'lightgreen'
+            title = 'Student GPA Comparison'
+            
+        # Reuse one figure across calls instead of allocating a new one each time
+        fig = plt.figure(num='SIS Performance', figsize=(12, 6), clear=True)
+        
+        if len(scores) <= max_bars:
+            ax = fig.add_subplot(1, 1, 1)
+            bars = ax.bar(names, scores, color=color)
+            ax.bar_label(bars, padding=2)
+            ax.set_xlabel('Students')
+            ax.set_ylabel(label)
+            ax.set_title(title)
+            ax.set_ylim(0, limit)
+            ax.tick_params(axis='x', labelrotation=45)
+        else:
+            self._plot_aggregated(fig, course_marks, names, scores, label, limit, color, title, top_n)
             
+        fig.tight_layout()
+        if filename:
+            fig.savefig(filename)
+            self.events.emit('plot_saved', f"Plot saved to {filename}", filename=filename)
+        else:
+            plt.show()
+        return fig
+        
+    def _plot_aggregated(self, fig, course_marks, names, scores, label, limit, color, title, top_n):
+        """Summary plots whose cost depends on the number of bins/courses, not students"""
+        ax_hist = fig.add_subplot(1, 3, 1)
+        ax_hist.hist(scores, bins=20, range=(0, limit), color=color, edgecolor='black')
+        ax_hist.set_xlabel(label)
+        ax_hist.set_ylabel('Students')
+        ax_hist.set_title(f'{title} ({len(scores)} students)')
+        
+        ax_box = fig.add_subplot(1, 3, 2)
+        box_courses = list(course_marks)
+        if box_courses:
+            ax_box.boxplot([course_marks[c] for c in box_courses], showfliers=False)
+            ax_box.set_xticks(range(1, len(box_courses) + 1), box_courses, rotation=45)
+        ax_box.set_ylabel('Marks')
+        ax_box.set_title('Marks by Course')
+        
+        ax_rank = fig.add_subplot(1, 3, 3)
+        order = sorted(range(len(scores)), key=scores.__getitem__, reverse=True)
+        picked = order[:top_n] + order[-top_n:] if len(order) > 2 * top_n else order
+        # Positional bars so students sharing a name don't collapse into one
+        bars = ax_rank.barh(range(len(picked)), [scores[i] for i in picked],
+                            color=[color if k < top_n else 'salmon' for k in range(len(picked))])
+        ax_rank.bar_label(bars, padding=2)
+        ax_rank.set_yticks(range(len(picked)), [names[i] for i in picked])
+        ax_rank.invert_yaxis()
+        ax_rank.set_xlim(0, limit)
+        ax_rank.set_xlabel(label)
+        ax_rank.set_title(f'Top {top_n} / Bottom {top_n}')
+        
+    @_reads
     def export_to_csv(self, filename='student_data.csv'):
         if not self.students:
-            print("No students in the system to export.")
+            self.events.emit('no_data', "No students in the system to export.", WARNING)
             return False
             
         try:
             with open(filename, 'w', newline='') as csvfile:
                 # Write students basic info
                 writer = csv.writer(csvfile)
-                writer.writerow(['Student ID', 'Name', 'Age', 'Grade Level', 'Email', 'GPA', 'Course', 'Marks', 'Grade'])
+                writer.writerow(['Student ID', 'Name', 'Age', 'Grade Level', 'Email', 'GPA', 'Course', 'Marks', 'Grade',
+                                 'Term', 'Credits'])
                 
                 for student in self.students.values():
                     gpa = student.calculate_gpa()
-                    if student.courses:
-                        for course, marks in student.courses.items():
+                    # Every term from the history; blank credits mean the policy default
+                    enrollments = self.history.records(student.student_id)
+                    if enrollments:
+                        for term, course, marks, credits in enrollments:
                             writer.writerow([
                                 student.student_id,
                                 student.name,
@@ -332,7 +1069,9 @@ class StudentInformationSystem:
                                 gpa,
                                 course,
                                 marks,
-                                student.get_grade(course)
+                                self.grading_policy.letter_grades(marks, student.grade_level),
+                                term,
+                                '' if credits is None else credits
                             ])
                     else:
                         writer.writerow([
@@ -342,79 +1081,474 @@ class StudentInformationSystem:
                             student.grade_level,
                             student.email,
                             gpa,
-                            '', '', ''
+                            '', '', '', '', ''
                         ])
                         
-            print(f"Data exported successfully to {filename}")
+            self.events.emit('data_exported', f"Data exported successfully to {filename}", filename=filename)
             return True
         except Exception as e:
-            print(f"Error exporting data: {e}")
+            self.events.emit('error', f"Error exporting data: {e}", ERROR, filename=filename)
             return False
             
+    @_writes
     def import_from_csv(self, filename='student_data.csv'):
         if not os.path.exists(filename):
-            print(f"File {filename} not found.")
+            self.events.emit('not_found', f"File {filename} not found.", WARNING, filename=filename)
             return False
             
         try:
         
             self.students = {}
             self.courses = set()
+            self._rank_index = {}
+            self.history = EnrollmentHistory(self.grading_policy)
             
             df = pd.read_csv(filename)
             processed_students = set()
             
-            for _, row in df.iterrows():
-                student_id = row['Student ID']
-                if student_id not in processed_students:
-                    self.add_student(
-                        student_id,
-                        row['Name'],
-                        row['Age'],
-                        row['Grade Level'],
-                        row['Email'] if 'Email' in row and not pd.isna(row['Email']) else None
-                    )
-                    processed_students.add(student_id)
+            # Per-row events still reach the buffer and audit file, just not stdout
+            with self.events.quiet(WARNING):
+                for _, row in df.iterrows():
+                    student_id = row['Student ID']
+                    if student_id not in processed_students:
+                        self.add_student(
+                            student_id,
+                            row['Name'],
+                            row['Age'],
+                            row['Grade Level'],
+                            row['Email'] if 'Email' in row and not pd.isna(row['Email']) else None
+                        )
+                        processed_students.add(student_id)
                 
-                if 'Course' in row and not pd.isna(row['Course']) and row['Course'] != '':
-                    self.add_course_marks(student_id, row['Course'], row['Marks'])
+                    if 'Course' in row and not pd.isna(row['Course']) and row['Course'] != '':
+                        # Files exported before terms and credits were added hold current-term marks only
+                        term = row['Term'] if 'Term' in row and not pd.isna(row['Term']) else None
+                        credits = row['Credits'] if 'Credits' in row and not pd.isna(row['Credits']) else None
+                        self.add_course_marks(student_id, row['Course'], row['Marks'], term, credits)
                     
-            print(f"Data imported successfully from {filename}")
+            self.events.emit('data_imported', f"Data imported successfully from {filename}", filename=filename, students=len(self.students))
             return True
         except Exception as e:
-            print(f"Error importing data: {e}")
+            self.events.emit('error', f"Error importing data: {e}", ERROR, filename=filename)
             return False
+            
+    @_reads
+    def content_snapshot(self):
+        """Content-hashed copy of every student and all their enrollments across terms"""
+        return {student.student_id: _content_record(student.name, student.age, student.grade_level,
+                                                    student.email, self.history.records(student.student_id))
+                for student in self.students.values()}
+        
+    def _drop_enrollment(self, student_id, course, term):
+        if term == self.current_term:
+            self.remove_course(student_id, course)
+        else:
+            self.history.remove(student_id, course, term)
+        
+    @_writes
+    def apply_delta(self, snapshot, delta):
+        """Apply the inserts, updates and deletes from diff_snapshots() using records from snapshot"""
+        with self.events.quiet():
+            for student_id in delta['delete']:
+                self.delete_student(student_id)
+                
+            for student_id in delta['insert']:
+                name, age, grade_level, email, enrollments = snapshot[student_id][1]
+                self.add_student(student_id, name, age, grade_level, email)
+                for term, course, marks, credits in enrollments:
+                    self.add_course_marks(student_id, course, marks, term, credits)
+                    
+            for student_id in delta['update']:
+                name, age, grade_level, email, enrollments = snapshot[student_id][1]
+                self.update_student(student_id, name=name, age=age, grade_level=grade_level, email=email)
+                incoming = {(term, course): (marks, credits) for term, course, marks, credits in enrollments}
+                current = {(term, course): (marks, credits)
+                           for term, course, marks, credits in self.history.records(student_id)}
+                for term, course in [key for key in current if key not in incoming]:
+                    self._drop_enrollment(student_id, course, term)
+                for (term, course), (marks, credits) in incoming.items():
+                    if current.get((term, course)) != (marks, credits):
+                        # Drop first so credits can go back to the policy default
+                        if (term, course) in current:
+                            self._drop_enrollment(student_id, course, term)
+                        self.add_course_marks(student_id, course, marks, term, credits)
+                        
+        counts = {kind: len(ids) for kind, ids in delta.items()}
+        self.events.emit('sync', f"Applied {counts['insert']} inserts, {counts['update']} updates, "
+                         f"{counts['delete']} deletes.", **counts)
+        return counts
+        
+    def sync_from_csv(self, filename='student_data.csv'):
+        """Bring the system in line with an exported CSV, touching only changed students"""
+        if not os.path.exists(filename):
+            self.events.emit('not_found', f"File {filename} not found.", WARNING, filename=filename)
+            return None
+            
+        try:
+            incoming = snapshot_from_csv(filename, self.current_term)
+        except (KeyError, csv.Error) as e:
+            self.events.emit('error', f"Error reading {filename}: {e}", ERROR, filename=filename)
+            return None
+            
+        with self._lock.write():
+            delta = diff_snapshots(self.content_snapshot(), incoming)
+            return self.apply_delta(incoming, delta)
+        
+    @_reads
+    def snapshot(self):
+        """
+        Return a read-only columnar copy of the roster: one list per student
+        attribute plus flattened course/marks/credits lists indexed by 'offsets'.
+        """
+        snap = {'student_id': [], 'name': [], 'age': [], 'grade_level': [], 'email': [],
+                'rank': [], 'offsets': [0], 'course': [], 'marks': [], 'credits': [], 'policy': self.grading_policy}
+        gpa_scores = self._get_rank_index()
+        
+        for student in self.students.values():
+            snap['student_id'].append(student.student_id)
+            snap['name'].append(student.name)
+            snap['age'].append(student.age)
+            snap['grade_level'].append(student.grade_level)
+            snap['email'].append(student.email)
+            snap['rank'].append(len(gpa_scores) - bisect.bisect_right(gpa_scores, student.calculate_gpa()) + 1)
+            snap['course'].extend(student.courses.keys())
+            snap['marks'].extend(student.courses.values())
+            snap['credits'].extend(student.credits.get(course) for course in student.courses)
+            snap['offsets'].append(len(snap['course']))
+            
+        return snap
+        
+    def generate_report_cards(self, fmt='dict', workers=None, chunk_size=None):
+        """
+        Generate a report card for every student, partitioning the roster
+        across a process pool. fmt is 'dict' (PDF-ready structure), 'text'
+        or 'csv'. Returns the report cards in roster order.
+        """
+        if fmt not in ('dict', 'text', 'csv'):
+            self.events.emit('error', f"Unknown report format {fmt}. Use 'dict', 'text' or 'csv'.", ERROR)
+            return None
+            
+        if not self.students:
+            self.events.emit('no_data', "No students in the system.", WARNING)
+            return []
+            
+        start_time = time.perf_counter()
+        snap = self.snapshot()
+        n = len(snap['student_id'])
+        workers = workers or os.cpu_count() or 1
+        
+        if workers == 1 or n < 1000:
+            reports = _build_report_cards(0, n, fmt, snap)
+            workers = 1
+        else:
+            # A few chunks per worker keeps the pool balanced without much IPC
+            chunk_size = chunk_size or max(1, -(-n // (workers * 4)))
+            bounds = [(i, min(i + chunk_size, n)) for i in range(0, n, chunk_size)]
+            reports = []
+            # Forked workers inherit the snapshot for free; others get one pickled copy each
+            _init_report_worker(snap)
+            try:
+                initargs = () if multiprocessing.get_start_method() == 'fork' else (snap,)
+                with ProcessPoolExecutor(max_workers=workers,
+                                         initializer=_init_report_worker if initargs else None,
+                                         initargs=initargs) as pool:
+                    futures = [pool.submit(_build_report_cards, lo, hi, fmt) for lo, hi in bounds]
+                    for future in futures:
+                        reports.extend(future.result())
+            finally:
+                # Don't keep the whole roster alive if a worker fails
+                _init_report_worker(None)
+                    
+        elapsed = time.perf_counter() - start_time
+        self.events.emit('report_cards', f"Generated {n} report cards in {elapsed:.2f} sec "
+                         f"({n / elapsed:,.0f} students/sec, {workers} worker(s))",
+                         students=n, seconds=elapsed, workers=workers)
+        return reports
+
+# Read-only columnar snapshot shared with report-card worker processes
+_report_snapshot = None
+
+def _init_report_worker(snapshot):
+    global _report_snapshot
+    _report_snapshot = snapshot
+
+def _format_report_card(report, fmt):
+    if fmt == 'dict':
+        return report
+        
+    if fmt == 'csv':
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(['Student ID', 'Name', 'Grade Level', 'GPA', 'Rank', 'Course', 'Marks', 'Grade'])
+        for row in report['Courses']:
+            writer.writerow([report['Student ID'], report['Name'], report['Grade Level'],
+                             report['GPA'], report['Rank'], row['Course'], row['Marks'], row['Grade']])
+        return buffer.getvalue()
+        
+    lines = [
+        "REPORT CARD",
+        f"Student ID: {report['Student ID']}",
+        f"Name: {report['Name']}",
+        f"Grade Level: {report['Grade Level']}",
+        "-" * 40,
+    ]
+    for row in report['Courses']:
+        lines.append(f"{row['Course']:<25}{row['Marks']:>8}{row['Grade']:>5}")
+    lines.append("-" * 40)
+    lines.append(f"GPA: {report['GPA']}    Class Rank: {report['Rank']} of {report['Class Size']}")
+    return "\n".join(lines)
+
+def _build_report_cards(start, stop, fmt='dict', snapshot=None):
+    """Build report cards for students start..stop-1 of a columnar snapshot"""
+    snap = snapshot if snapshot is not None else _report_snapshot
+    offsets = snap['offsets']
+    reports = []
+    
+    for i in range(start, stop):
+        student = Student(snap['student_id'][i], snap['name'][i], snap['age'][i],
+                          snap['grade_level'][i], snap['email'][i], snap['policy'])
+        for j in range(offsets[i], offsets[i + 1]):
+            student.add_course(snap['course'][j], snap['marks'][j], snap['credits'][j])
+            
+        report = {
+            'Student ID': student.student_id,
+            'Name': student.name,
+            'Age': student.age,
+            'Grade Level': student.grade_level,
+            'Email': student.email,
+            'GPA': student.calculate_gpa(),
+            'Rank': snap['rank'][i],
+            'Class Size': len(snap['student_id']),
+            'Courses': [{'Course': course, 'Marks': marks, 'Grade': student.get_grade(course)}
+                        for course, marks in student.courses.items()]
+        }
+        reports.append(_format_report_card(report, fmt))
+        
+    return reports
+
+SYNTHETIC_COURSES = ["Mathematics", "Physics", "Chemistry", "Biology", "Computer Science",
+                     "English", "History", "Geography", "Economics", "Art"]
+FIRST_NAMES = ["James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda",
+               "David", "Elizabeth", "William", "Barbara", "Richard", "Susan", "Joseph", "Jessica"]
+LAST_NAMES = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis",
+              "Rodriguez", "Martinez", "Hernandez", "Lopez", "Wilson", "Anderson", "Thomas", "Taylor"]
+
+def generate_roster(n_students, n_courses=8, courses_per_student=5, seed=0):
+    """
+    Generate a seeded synthetic roster as columnar arrays. Each course has
+    its own difficulty (mean 60-85) and each student an ability offset, so
+    marks are correlated across a student's courses like real results.
+    Returns a dict with per-student columns and flattened enrollment
+    columns ('student_index', 'course', 'marks').
+    """
+    rng = np.random.default_rng(seed)
+    courses = np.array(SYNTHETIC_COURSES[:n_courses] +
+                       [f"Course {i}" for i in range(len(SYNTHETIC_COURSES), n_courses)], dtype=object)
+    courses_per_student = min(courses_per_student, n_courses)
+    
+    levels = rng.integers(9, 13, n_students)
+    roster = {
+        'student_id': np.arange(100000, 100000 + n_students),
+        'name': [f"{FIRST_NAMES[f]} {LAST_NAMES[l]}" for f, l in
+                 zip(rng.integers(0, len(FIRST_NAMES), n_students).tolist(),
+                     rng.integers(0, len(LAST_NAMES), n_students).tolist())],
+        'age': (levels + 5 + rng.integers(0, 2, n_students)).tolist(),
+        'grade_level': [f"{level}th" for level in levels.tolist()],
+    }
+    
+    # Distinct courses per student: the first k columns of a random permutation
+    picks = np.argsort(rng.random((n_students, n_courses)), axis=1)[:, :courses_per_student]
+    difficulty = rng.uniform(60, 85, n_courses)
+    ability = rng.normal(0, 8, n_students)
+    marks = difficulty[picks] + ability[:, None] + rng.normal(0, 7, picks.shape)
+    
+    roster['student_index'] = np.repeat(np.arange(n_students), courses_per_student)
+    roster['course'] = courses[picks.ravel()]
+    roster['marks'] = np.clip(np.rint(marks), 0, 100).astype(int).ravel()
+    return roster
+
+def load_roster(system, roster):
+    """Add a generated roster to a StudentInformationSystem through its public mutators"""
+    ids = roster['student_id'].tolist()
+    with system.events.quiet():
+        for i, student_id in enumerate(ids):
+            system.add_student(student_id, roster['name'][i], roster['age'][i], roster['grade_level'][i])
+        for i, course, marks in zip(roster['student_index'].tolist(), roster['course'].tolist(),
+                                    roster['marks'].tolist()):
+            system.add_course_marks(ids[i], course, marks)
+    return system
+
+def run_benchmarks(sizes=(1000, 100000, 1000000), seed=0, track_memory=True, results_file=None):
+    """
+    Time the main SIS operations on synthetic rosters of each size and
+    record peak traced memory per operation. tracemalloc slows Python code
+    down noticeably, so compare runs with the same track_memory setting.
+    """
+    import tempfile
+    import tracemalloc
+    
+    results = []
+    pd.DataFrame()  # Keep the one-off lazy pandas import out of the timings
+    
+    def measure(size, operation, func):
+        if track_memory:
+            tracemalloc.start()
+        start_time = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start_time
+        peak = 0
+        if track_memory:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        results.append({'Students': size, 'Operation': operation, 'Seconds': round(elapsed, 4),
+                        'Peak MB': round(peak / 2 ** 20, 2)})
+        print(f"{size:>9} students  {operation:<22} {elapsed:9.3f} sec  {peak / 2 ** 20:9.1f} MB")
+        
+    for size in sizes:
+        roster = generate_roster(size, seed=seed)
+        system = StudentInformationSystem()
+        system.events.verbosity = SILENT
+        first_id = int(roster['student_id'][0])
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_file = os.path.join(tmp, 'roster.csv')
+            measure(size, 'add', lambda: load_roster(system, roster))
+            measure(size, 'list_all_students', system.list_all_students)
+            measure(size, 'performance summary', lambda: system.get_performance_summary(first_id))
+            measure(size, 'performance summary all', system.get_performance_summary)
+            measure(size, 'topper (GPA)', system.find_class_topper)
+            measure(size, 'topper (course)', lambda: system.find_class_topper('Mathematics'))
+            measure(size, 'export', lambda: system.export_to_csv(csv_file))
+            importer = StudentInformationSystem()
+            importer.events.verbosity = SILENT
+            measure(size, 'bulk import', lambda: importer.import_from_csv(csv_file))
+            
+    df = pd.DataFrame(results)
+    if results_file:
+        df.to_csv(results_file, index=False)
+    return df
+
+def benchmark_visualization(sizes=(10, 100, 1000, 10000, 100000), filename='benchmark_plot.png', seed=0):
+    """Time headless rendering of the GPA plot for increasing class sizes"""
+    results = []
+    
+    for size in sizes:
+        bench = StudentInformationSystem()
+        bench.events.verbosity = WARNING
+        load_roster(bench, generate_roster(size, seed=seed))
+        
+        start_time = time.perf_counter()
+        bench.visualize_performance(filename=filename)
+        elapsed = time.perf_counter() - start_time
+        results.append({'Students': size, 'Render Time (sec)': round(elapsed, 4)})
+        
+    plt.close('SIS Performance')
+    return pd.DataFrame(results)
+
+def load_test(threads=8, duration=2.0, write_ratio=0.1, students=1000, seed=0):
+    """Hammer one SIS from several threads with mixed reads/writes and report throughput"""
+    courses = ["Mathematics", "Physics", "Chemistry", "Biology", "Computer Science"]
+    bench = StudentInformationSystem()
+    bench.events.verbosity = SILENT
+    for i in range(students):
+        bench.add_student(i, f"Student {i}", 17, "11th")
+        bench.add_course_marks(i, courses[i % len(courses)], 50 + i % 50)
+        
+    stop = threading.Event()
+    totals = []
+    
+    def worker(index):
+        rng = random.Random(seed + index)
+        reads = writes = 0
+        while not stop.is_set():
+            student_id = rng.randrange(students)
+            if rng.random() < write_ratio:
+                bench.add_course_marks(student_id, rng.choice(courses), rng.randint(40, 100))
+                writes += 1
+            else:
+                op = rng.randrange(3)
+                if op == 0:
+                    bench.get_student(student_id)
+                elif op == 1:
+                    bench.rank(student_id)
+                else:
+                    bench.get_term_gpa(student_id)
+                reads += 1
+        totals.append((reads, writes))
+        
+    pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    start_time = time.perf_counter()
+    for thread in pool:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - start_time
+    
+    reads = sum(r for r, _ in totals)
+    writes = sum(w for _, w in totals)
+    print(f"{threads} threads, {elapsed:.2f} sec: {reads / elapsed:,.0f} reads/sec, {writes / elapsed:,.0f} writes/sec")
+    return {'threads': threads, 'seconds': elapsed, 'reads_per_sec': reads / elapsed, 'writes_per_sec': writes / elapsed}
+
+def benchmark_startup(budget_ms=300):
+    """
+    Measure the cost of `import SIS` in a fresh interpreter with
+    `python -X importtime` and check that no heavy dependency was loaded.
+    """
+    import subprocess
+    import sys
+    
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import SIS'],
+                            cwd=os.path.dirname(os.path.abspath(__file__)),
+                            capture_output=True, text=True, check=True)
+    
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if line.startswith('import time:') and '|' in line:
+            _, total_us, module = line.split('|')
+            if total_us.strip().isdigit():
+                cumulative[module.strip()] = int(total_us)
+                
+    total_ms = cumulative.get('SIS', 0) / 1000
+    heavy = [name for name in ('pandas', 'matplotlib', 'IPython') if name in cumulative]
+    report = {'import_ms': total_ms, 'heavy_modules_loaded': heavy,
+              'within_budget': total_ms <= budget_ms and not heavy}
+    print(f"import SIS: {total_ms:.1f} ms (budget {budget_ms} ms), heavy modules loaded: {heavy or 'none'}")
+    return report
 
 sis = StudentInformationSystem()
 
 
-def demo_initialize_data():
-    sis.add_student(1001, "John Smith", 18, "12th", "john@example.com")
-    sis.add_student(1002, "Emma Johnson", 17, "11th", "emma@example.com")
-    sis.add_student(1003, "Michael Brown", 18, "12th", "michael@example.com")
-    sis.add_student(1004, "Olivia Davis", 17, "11th", "olivia@example.com")
-    sis.add_student(1005, "William Wilson", 16, "10th", "william@example.com")
+def demo_initialize_data(system=None):
+    if system is None:
+        system = sis
+    system.add_student(1001, "John Smith", 18, "12th", "john@example.com")
+    system.add_student(1002, "Emma Johnson", 17, "11th", "emma@example.com")
+    system.add_student(1003, "Michael Brown", 18, "12th", "michael@example.com")
+    system.add_student(1004, "Olivia Davis", 17, "11th", "olivia@example.com")
+    system.add_student(1005, "William Wilson", 16, "10th", "william@example.com")
     
     # Add course marks
-    sis.add_course_marks(1001, "Mathematics", 92)
-    sis.add_course_marks(1001, "Physics", 88)
-    sis.add_course_marks(1001, "Chemistry", 78)
+    system.add_course_marks(1001, "Mathematics", 92)
+    system.add_course_marks(1001, "Physics", 88)
+    system.add_course_marks(1001, "Chemistry", 78)
     
-    sis.add_course_marks(1002, "Mathematics", 95)
-    sis.add_course_marks(1002, "Biology", 90)
-    sis.add_course_marks(1002, "Chemistry", 82)
+    system.add_course_marks(1002, "Mathematics", 95)
+    system.add_course_marks(1002, "Biology", 90)
+    system.add_course_marks(1002, "Chemistry", 82)
     
-    sis.add_course_marks(1003, "Mathematics", 75)
-    sis.add_course_marks(1003, "Physics", 80)
-    sis.add_course_marks(1003, "Computer Science", 98)
+    system.add_course_marks(1003, "Mathematics", 75)
+    system.add_course_marks(1003, "Physics", 80)
+    system.add_course_marks(1003, "Computer Science", 98)
     
-    sis.add_course_marks(1004, "Mathematics", 88)
-    sis.add_course_marks(1004, "Biology", 92)
-    sis.add_course_marks(1004, "Chemistry", 85)
+    system.add_course_marks(1004, "Mathematics", 88)
+    system.add_course_marks(1004, "Biology", 92)
+    system.add_course_marks(1004, "Chemistry", 85)
     
-    sis.add_course_marks(1005, "Mathematics", 78)
-    sis.add_course_marks(1005, "Physics", 65)
-    sis.add_course_marks(1005, "Chemistry", 72)
+    system.add_course_marks(1005, "Mathematics", 78)
+    system.add_course_marks(1005, "Physics", 65)
+    system.add_course_marks(1005, "Chemistry", 72)
     
     print("Sample data initialized successfully")
 
@@ -433,6 +1567,7 @@ def menu():
     print("9. Export data to CSV")
     print("10. Import data from CSV")
     print("11. Initialize sample data")
+    print("12. Generate report cards")
     print("0. Exit")
     print("="*50)
     
@@ -540,7 +1675,9 @@ def add_course_marks_ui():
         print("Marks should be a number.")
         return
     
-    sis.add_course_marks(student_id, course, marks)
+    term = input(f"Enter Term (default: {sis.current_term}): ")
+    
+    sis.add_course_marks(student_id, course, marks, term or None)
 
 def view_performance_ui():
     print("\n--- View Student Performance ---")
@@ -560,6 +1697,8 @@ def view_performance_ui():
             
         print(f"\nPerformance Summary for {student.name}:")
         print(f"GPA: {student.calculate_gpa()}")
+        print(f"Cumulative GPA (all terms): {sis.get_term_gpa(student_id)}")
+        print(f"Class Rank: {sis.rank(student_id)} of {len(sis.students)} (percentile {sis.percentile(student_id)})")
         
         summary = sis.get_performance_summary(student_id)
         if summary is not None:
@@ -612,10 +1751,11 @@ def visualize_ui():
         if course not in sis.courses:
             print(f"Course {course} not found.")
             return
-            
-        sis.visualize_performance(course)
     else:
-        sis.visualize_performance()
+        course = None
+        
+    filename = input("Save plot to file (leave blank to display): ")
+    sis.visualize_performance(course, filename=filename or None)
 
 def export_data_ui():
     print("\n--- Export Data to CSV ---")
@@ -639,10 +1779,30 @@ def import_data_ui():
     if not filename.endswith('.csv'):
         filename += '.csv'
         
+    mode = input("(1) Replace all data or (2) sync only changed students? (1/2): ")
+    if mode == '2':
+        sis.sync_from_csv(filename)
+        return
+        
     confirm = input("This will overwrite all current data. Continue? (y/n): ")
     if confirm.lower() == 'y':
         sis.import_from_csv(filename)
 
+def report_cards_ui():
+    print("\n--- Generate Report Cards ---")
+    
+    filename = input("Enter filename (default: report_cards.txt): ")
+    if not filename:
+        filename = 'report_cards.txt'
+        
+    reports = sis.generate_report_cards('text')
+    if not reports:
+        return
+        
+    with open(filename, 'w') as f:
+        f.write("\n\n".join(reports))
+    print(f"Report cards written to {filename}")
+
 def run_sis():
     while True:
         choice = menu()
@@ -675,11 +1835,13 @@ def run_sis():
             import_data_ui()
         elif choice == '11':
             demo_initialize_data()
+        elif choice == '12':
+            report_cards_ui()
         else:
             print("Invalid choice. Please try again.")
         
         input("\nPress Enter to continue...")
         clear_output(wait=True)
 
-# Uncomment to run the system
-run_sis()
+if __name__ == "__main__":
+    run_sis()
@@ -0,0 +1,361 @@
+import asyncio
+import json
+import os
+import time
+import argparse
+from collections import OrderedDict
+from urllib.parse import urlsplit, parse_qs, unquote
+
+import numpy as np
+
+import SIS
+
+STATUS_TEXT = {200: 'OK', 201: 'Created', 400: 'Bad Request', 404: 'Not Found',
+               405: 'Method Not Allowed', 500: 'Internal Server Error'}
+
+def _json_default(obj):
+    """Convert NumPy/pandas scalars that json can't serialise"""
+    if isinstance(obj, np.generic):
+        return obj.item()
+    return str(obj)
+
+def _parse_id(value):
+    return int(value) if value.lstrip('-').isdigit() else value
+
+class SISServer:
+    """
+    Minimal asyncio HTTP/1.1 JSON front-end for a StudentInformationSystem.
+
+    Routes:
+        GET    /students                      list all students
+        POST   /students                      add a student
+        GET    /students/{id}                 student details and courses
+        PATCH  /students/{id}                 update student fields
+        DELETE /students/{id}                 delete a student
+        GET    /students/{id}/summary         performance summary
+        POST   /students/{id}/marks           add/update course marks
+        DELETE /students/{id}/marks/{course}  remove a course
+        GET    /topper[?course=...]           class topper
+        POST   /export                        export to CSV in export_dir (bare file name only)
+        POST   /batch                         run a list of {method, path, body} requests
+
+    GET responses are cached until the next write or for cache_ttl seconds,
+    keeping at most cache_size entries (least recently used evicted first).
+    """
+
+    def __init__(self, system=None, host='127.0.0.1', port=8080, cache_ttl=5.0, cache_size=1024,
+                 export_dir='.'):
+        self.system = system or SIS.sis
+        self.export_dir = export_dir
+        self.host = host
+        self.port = port
+        self.cache_ttl = cache_ttl
+        self.cache_size = cache_size
+        self.cache = OrderedDict()  # path: (expiry time, status, body), least recently used first
+        self.generation = 0  # bumped by every successful write
+        self.server = None
+        self.connections = set()
+        self.handlers = set()  # connection handler tasks, cancelled on stop()
+        self.requests_served = 0
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        self.server.close()
+        for writer in list(self.connections):
+            writer.close()
+        handlers = list(self.handlers)
+        for task in handlers:
+            task.cancel()
+        await asyncio.gather(*handlers, return_exceptions=True)
+        await self.server.wait_closed()
+
+    async def _handle_client(self, reader, writer):
+        self.connections.add(writer)
+        task = asyncio.current_task()
+        self.handlers.add(task)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, version = request_line.decode('latin-1').split()
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    key, _, value = line.decode('latin-1').partition(':')
+                    headers[key.strip().lower()] = value.strip()
+
+                length = int(headers.get('content-length', 0))
+                raw_body = await reader.readexactly(length) if length else b''
+
+                status, payload = await self.dispatch(method, target, raw_body)
+                body = payload if isinstance(payload, bytes) else json.dumps(payload, default=_json_default).encode()
+                keep_alive = headers.get('connection', '').lower() != 'close' and version == 'HTTP/1.1'
+
+                writer.write(
+                    f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(body)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + body
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            self.connections.discard(writer)
+            self.handlers.discard(task)
+            writer.close()
+
+    async def dispatch(self, method, target, raw_body=b''):
+        """Route one request, serving cached GET responses where possible"""
+        self.requests_served += 1
+        if method == 'GET':
+            cached = self.cache.get(target)
+            if cached:
+                if cached[0] > time.monotonic():
+                    self.cache.move_to_end(target)
+                    return cached[1], cached[2]
+                del self.cache[target]
+        generation = self.generation
+
+        try:
+            body = json.loads(raw_body) if raw_body else {}
+        except json.JSONDecodeError as e:
+            return 400, {'error': f"Invalid JSON: {e}"}
+
+        try:
+            status, payload = await self._route(method, target, body)
+        except (KeyError, TypeError, ValueError) as e:
+            return 400, {'error': f"Bad request: {e}"}
+        except Exception as e:
+            return 500, {'error': str(e)}
+
+        if method == 'GET':
+            if status == 200:
+                # Cache the encoded body so hits skip serialisation too
+                payload = json.dumps(payload, default=_json_default).encode()
+                # A write that finished while this GET ran in its thread may have made it stale
+                if generation == self.generation and self.cache_ttl > 0:
+                    self.cache[target] = (time.monotonic() + self.cache_ttl, status, payload)
+                    self.cache.move_to_end(target)
+                    if len(self.cache) > self.cache_size:
+                        self.cache.popitem(last=False)
+        elif status < 400:
+            self.generation += 1
+            self.cache.clear()
+        return status, payload
+
+    def _student_not_found(self, student_id):
+        return 404, {'error': f"Student with ID {student_id} not found."}
+
+    async def _route(self, method, target, body):
+        url = urlsplit(target)
+        parts = [unquote(p) for p in url.path.strip('/').split('/') if p]
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+
+        if parts == ['batch'] and method == 'POST':
+            if not isinstance(body, list) or not all(isinstance(item, dict) for item in body):
+                return 400, {'error': "Batch body must be a list of {method, path, body} objects"}
+            results = []
+            for item in body:
+                raw = json.dumps(item.get('body')).encode() if item.get('body') is not None else b''
+                status, payload = await self.dispatch(item['method'].upper(), item['path'], raw)
+                if isinstance(payload, bytes):
+                    payload = json.loads(payload)
+                results.append({'status': status, 'body': payload})
+            return 200, results
+
+        # SIS calls block (pandas, file I/O, the RW lock), so run them off the event loop
+        return await asyncio.to_thread(self._route_system, method, url, parts, query, body)
+
+    def _route_system(self, method, url, parts, query, body):
+        system = self.system
+
+        if parts == ['topper'] and method == 'GET':
+            topper = system.find_class_topper(query.get('course'))
+            if not topper:
+                course = query.get('course')
+                return 404, {'error': f"No marks recorded for {course}." if course else "No students with marks."}
+            return 200, topper
+
+        if parts == ['export'] and method == 'POST':
+            filename = body.get('filename', 'student_data.csv')
+            if not isinstance(filename, str) or filename in ('', '.', '..') or os.path.basename(filename) != filename:
+                return 400, {'error': "filename must be a plain file name with no directory part"}
+            os.makedirs(self.export_dir, exist_ok=True)
+            ok = system.export_to_csv(os.path.join(self.export_dir, filename))
+            return (200, {'exported': filename}) if ok else (400, {'error': "Nothing to export or the file could not be written."})
+
+        if not parts or parts[0] != 'students':
+            return 404, {'error': f"No route for {url.path}"}
+
+        if len(parts) == 1:
+            if method == 'GET':
+                return 200, system.list_all_students().to_dict(orient='records')
+            if method == 'POST':
+                ok = system.add_student(body['student_id'], body['name'], body['age'],
+                                        body['grade_level'], body.get('email'))
+                if not ok:
+                    return 400, {'error': f"Student with ID {body['student_id']} already exists."}
+                return 201, {'student_id': body['student_id']}
+            return 405, {'error': f"{method} not allowed"}
+
+        student_id = _parse_id(parts[1])
+
+        if len(parts) == 2:
+            if method == 'GET':
+                student = system.get_student(student_id)
+                if not student:
+                    return self._student_not_found(student_id)
+                return 200, {'student_id': student.student_id, 'name': student.name, 'age': student.age,
+                             'grade_level': student.grade_level, 'email': student.email,
+                             'gpa': student.calculate_gpa(), 'courses': dict(student.courses)}
+            if method == 'PATCH':
+                ok = system.update_student(student_id, **body)
+                return (200, {'updated': student_id}) if ok else self._student_not_found(student_id)
+            if method == 'DELETE':
+                ok = system.delete_student(student_id)
+                return (200, {'deleted': student_id}) if ok else self._student_not_found(student_id)
+            return 405, {'error': f"{method} not allowed"}
+
+        if parts[2] == 'summary' and method == 'GET':
+            summary = system.get_performance_summary(student_id)
+            if summary is None:
+                if student_id not in system.students:
+                    return self._student_not_found(student_id)
+                return 404, {'error': f"No courses found for student {student_id}."}
+            return 200, summary.to_dict(orient='records')
+
+        if parts[2] == 'marks':
+            if method == 'POST' and len(parts) == 3:
+                ok = system.add_course_marks(student_id, body['course'], body['marks'],
+                                             body.get('term'), body.get('credits'))
+                return (200, {'updated': student_id}) if ok else self._student_not_found(student_id)
+            if method == 'DELETE' and len(parts) == 4:
+                ok = system.remove_course(student_id, parts[3])
+                if ok:
+                    return 200, {'removed': parts[3]}
+                if student_id not in system.students:
+                    return self._student_not_found(student_id)
+                return 404, {'error': f"Course {parts[3]} not found for student {student_id}."}
+
+        return 404, {'error': f"No route for {method} {url.path}"}
+
+async def _client(host, port, paths, latencies):
+    """Send the GETs on one connection; returns the number of non-2xx responses"""
+    errors = 0
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for path in paths:
+            start_time = time.perf_counter()
+            writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode())
+            await writer.drain()
+
+            status = int((await reader.readline()).split()[1])
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b''):
+                    break
+                if line.lower().startswith(b'content-length:'):
+                    length = int(line.split(b':')[1])
+            await reader.readexactly(length)
+            if not 200 <= status < 300:
+                errors += 1
+            elif latencies is not None:
+                latencies.append(time.perf_counter() - start_time)
+    finally:
+        writer.close()
+        await writer.wait_closed()
+    return errors
+
+async def run_load(host='127.0.0.1', port=8080, requests=10000, concurrency=50, paths=None, warmup=2):
+    """
+    Send `requests` GETs over `concurrency` keep-alive connections, cycling
+    through `paths`, and report requests/sec with p50/p99 latency. Each path
+    is first requested `warmup` times untimed, so one-off costs such as
+    lazy imports don't land in the percentiles. Non-2xx responses are
+    counted as errors and left out of the throughput and latency figures.
+    """
+    paths = paths or ['/students', '/topper', '/students/1001', '/students/1001/summary']
+    per_client = requests // concurrency
+    latencies = []
+
+    if warmup:
+        await _client(host, port, paths * warmup, None)
+
+    start_time = time.perf_counter()
+    errors = await asyncio.gather(*[
+        _client(host, port, [paths[(c + i) % len(paths)] for i in range(per_client)], latencies)
+        for c in range(concurrency)
+    ])
+    elapsed = time.perf_counter() - start_time
+    errors = sum(errors)
+    if not latencies:
+        print(f"All {errors} requests failed")
+        return {'requests': 0, 'errors': errors, 'seconds': elapsed}
+
+    latencies_ms = np.array(latencies) * 1000
+    result = {
+        'requests': len(latencies),
+        'errors': errors,
+        'seconds': elapsed,
+        'requests_per_sec': len(latencies) / elapsed,
+        'p50_ms': float(np.percentile(latencies_ms, 50)),
+        'p99_ms': float(np.percentile(latencies_ms, 99))
+    }
+    print(f"{result['requests']} requests in {elapsed:.2f} sec: {result['requests_per_sec']:,.0f} req/sec, "
+          f"p50 {result['p50_ms']:.2f} ms, p99 {result['p99_ms']:.2f} ms")
+    if errors:
+        print(f"{errors} requests returned a non-2xx status")
+    return result
+
+async def benchmark(requests=10000, concurrency=50, cache_ttl=5.0):
+    """Start a server over a fresh system with the sample data on a free port and load-test it"""
+    system = SIS.StudentInformationSystem()
+    system.events.verbosity = SIS.ERROR
+    SIS.demo_initialize_data(system)
+    server = await SISServer(system=system, port=0, cache_ttl=cache_ttl).start()
+    try:
+        return await run_load(port=server.port, requests=requests, concurrency=concurrency)
+    finally:
+        await server.stop()
+
+async def serve(host, port, export_dir='.'):
+    server = await SISServer(host=host, port=port, export_dir=export_dir).start()
+    print(f"Serving Student Information System on http://{server.host}:{server.port}")
+    async with server.server:
+        await server.server.serve_forever()
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON HTTP service for the Student Information System")
+    parser.add_argument('command', choices=['serve', 'bench'])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--requests', type=int, default=10000)
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--export-dir', default='.', help="directory POST /export writes into")
+    parser.add_argument('--demo', action='store_true', help="load the sample students before serving")
+    args = parser.parse_args()
+
+    if args.command == 'serve':
+        if args.demo:
+            SIS.demo_initialize_data()
+        asyncio.run(serve(args.host, args.port, args.export_dir))
+    else:
+        print("With response cache:")
+        asyncio.run(benchmark(args.requests, args.concurrency))
+        print("Without response cache:")
+        asyncio.run(benchmark(args.requests, args.concurrency, cache_ttl=0))
+
+if __name__ == "__main__":
+    main()
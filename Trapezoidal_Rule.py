@@ -2,6 +2,29 @@ import numpy as np
 import matplotlib.pyplot as plt
 from sympy import symbols, sympify, lambdify
 import re
+import os
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+def parse_function(func_str, variables='x'):
+    """
+    Convert a math expression string into a NumPy-vectorized Python function
+    of the given variables (e.g. 'x' or 'x y'). Returns the function and the
+    cleaned-up expression string.
+    """
+    # Replace common math notation with Python syntax
+    func_str = re.sub(r'(?<![a-zA-Z0-9_])e(?![a-zA-Z0-9_])', 'E', func_str)  # Replace e with E for scientific notation
+    func_str = re.sub(r'(\d+)([a-zA-Z])', r'\1*\2', func_str)  # Replace '2x' with '2*x'
+    
+    # Define symbols and create sympify expression
+    symbols_ = symbols(variables)
+    expr = sympify(func_str)
+    
+    # Convert to numpy function
+    f = lambdify(symbols_, expr, 'numpy')
+    
+    return f, func_str
 
 def get_function_from_user():
     """Get a mathematical function from user input and convert it to a Python function"""
@@ -10,16 +33,7 @@ def get_function_from_user():
             # Get user input for the function
             func_str = input("Enter the function to integrate (e.g., x**2, sin(x), exp(-x**2), etc.): ")
             
-            # Replace common math notation with Python syntax
-            func_str = re.sub(r'(?<![a-zA-Z0-9_])e(?![a-zA-Z0-9_])', 'E', func_str)  # Replace e with E for scientific notation
-            func_str = re.sub(r'(\d+)([a-zA-Z])', r'\1*\2', func_str)  # Replace '2x' with '2*x'
-            
-            # Define symbol and create sympify expression
-            x = symbols('x')
-            expr = sympify(func_str)
-            
-            # Convert to numpy function
-            f = lambdify(x, expr, 'numpy')
+            f, func_str = parse_function(func_str)
             
             # Test the function with a simple value to make sure it works
             test_value = f(1.0)
@@ -57,6 +71,289 @@ def trapezoidal_rule(f, a, b, n):
     
     return integral, x, y
 
+def evaluate(f, x):
+    """Evaluate f on an array, broadcasting constant functions to the shape of x"""
+    return np.broadcast_to(np.asarray(f(x), dtype=float), np.shape(x))
+
+DEFAULT_CHUNK_SIZE = 1 << 20  # points per block in the streaming rules (8 MB per float64 array)
+STREAMING_THRESHOLD = 10**7  # above this many subintervals main uses the streaming rule
+
+def streaming_sum(f, start, step, count, chunk_size=DEFAULT_CHUNK_SIZE, first=0):
+    """
+    Sum f(start + i * step) for i = first .. first+count-1 one block at a time, so
+    memory stays at one block whatever count is. Points are computed from
+    their index (no accumulated drift in x), each block is summed pairwise
+    by np.sum and the block sums are combined with Neumaier's compensated
+    (Kahan) summation.
+    """
+    total = 0.0
+    compensation = 0.0
+    for block_start in range(first, first + count, chunk_size):
+        x = np.arange(block_start, min(block_start + chunk_size, first + count), dtype=float)
+        x *= step
+        x += start
+        block_sum = float(np.sum(evaluate(f, x)))
+        
+        t = total + block_sum
+        if abs(total) >= abs(block_sum):
+            compensation += (total - t) + block_sum
+        else:
+            compensation += (block_sum - t) + total
+        total = t
+    return total + compensation
+
+def trapezoidal_rule_streaming(f, a, b, n, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Trapezoidal rule for very large n with memory independent of n: the
+    interior points are evaluated block by block through streaming_sum and
+    never stored. Returns only the integral, since x and y are not kept.
+    """
+    h = (b - a) / n
+    ends = evaluate(f, np.array([a, b], dtype=float))
+    interior = streaming_sum(f, a, h, n - 1, chunk_size, first=1)
+    return h * (0.5 * ends[0] + interior + 0.5 * ends[1])
+
+_parsed_functions = {}
+
+def _block_sum(f, start, step, count, chunk_size, first):
+    """Worker task: f may be an expression string, parsed once per process"""
+    if isinstance(f, str):
+        if f not in _parsed_functions:
+            _parsed_functions[f] = parse_function(f)[0]
+        f = _parsed_functions[f]
+    return streaming_sum(f, start, step, count, chunk_size, first)
+
+def trapezoidal_rule_parallel(f, a, b, n, workers=None, backend='thread', chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Trapezoidal rule with the interior points 1 .. n-1 split into one
+    contiguous block per worker. Each block is streamed by its worker and
+    the partial sums are added with math.fsum; the endpoints a and b are
+    weighted once here, so block boundaries are never counted twice.
+    
+    backend is 'thread' (the default: NumPy releases the GIL inside its
+    ufuncs, and sympy-lambdified functions can't be pickled) or 'process',
+    in which case f must be an expression string (or a picklable function)
+    and is parsed once in each worker process. Returns only the integral.
+    """
+    workers = workers or os.cpu_count() or 1
+    f_local = parse_function(f)[0] if isinstance(f, str) else f
+    h = (b - a) / n
+    ends = evaluate(f_local, np.array([a, b], dtype=float))
+    
+    interior = n - 1
+    shares = [interior // workers + (1 if i < interior % workers else 0) for i in range(workers)]
+    firsts = [1 + sum(shares[:i]) for i in range(workers)]
+    
+    if workers == 1:
+        partials = [streaming_sum(f_local, a, h, interior, chunk_size, first=1)]
+    else:
+        Executor = ProcessPoolExecutor if backend == 'process' else ThreadPoolExecutor
+        task_f = f if backend == 'process' else f_local
+        with Executor(max_workers=workers) as pool:
+            partials = list(pool.map(_block_sum, [task_f] * workers, [a] * workers, [h] * workers,
+                                     shares, [chunk_size] * workers, firsts))
+    return h * math.fsum([0.5 * ends[0], *partials, 0.5 * ends[1]])
+
+def benchmark_parallel(func_str='exp(-x**2)*sin(50*x)', a=0.0, b=2.0, n=10**8,
+                       max_workers=None, backend='thread'):
+    """Report time and speedup of trapezoidal_rule_parallel for 1 up to max_workers workers"""
+    max_workers = max_workers or os.cpu_count() or 1
+    results = []
+    
+    for workers in range(1, max_workers + 1):
+        start_time = time.perf_counter()
+        integral = trapezoidal_rule_parallel(func_str, a, b, n, workers, backend)
+        elapsed = time.perf_counter() - start_time
+        
+        speedup = results[0]['seconds'] / elapsed if results else 1.0
+        results.append({'workers': workers, 'seconds': elapsed, 'speedup': speedup, 'integral': integral})
+        print(f"{workers:>3} workers ({backend}): {elapsed:.3f} sec, {n / elapsed:,.0f} points/sec, "
+              f"speedup {speedup:.2f}x, integral ≈ {integral:.12f}")
+    return results
+
+def trapezoidal_refinements(f, a, b, n=1):
+    """
+    Yield successive trapezoidal approximations with n, 2n, 4n, ...
+    subintervals as (n, integral, evaluations). Each doubling keeps the
+    previous sum and only evaluates f at the new midpoints, so going from
+    n to 2n costs n evaluations instead of 2n + 1.
+    """
+    h = (b - a) / n
+    integral = trapezoidal_rule_streaming(f, a, b, n)
+    evaluations = n + 1
+    while True:
+        yield n, integral, evaluations
+        integral = 0.5 * integral + 0.5 * h * streaming_sum(f, a + 0.5 * h, h, n)
+        evaluations += n
+        n *= 2
+        h /= 2
+
+def uniform_trapezoidal(f, a, b, tol=1e-6, max_n=2**24, min_n=16):
+    """
+    Double a uniform n until successive estimates agree to within tol
+    (Richardson error estimate |T(2n) - T(n)| / 3). The test only starts
+    once n reaches min_n, so a few coincident samples of an oscillating f
+    can't end it early.
+    
+    Returns the integral, the error estimate, n and the evaluation count.
+    """
+    previous = None
+    for n, integral, evaluations in trapezoidal_refinements(f, a, b):
+        if previous is not None:
+            error = abs(integral - previous) / 3
+            if (error <= tol and n >= min_n) or n >= max_n:
+                return integral, error, n, evaluations
+        previous = integral
+
+def romberg(f, a, b, tol=1e-10, max_levels=25, min_levels=4):
+    """
+    Romberg integration: Richardson extrapolation of the nested trapezoidal
+    estimates T(1), T(2), T(4), ... from trapezoidal_refinements, so each
+    level only evaluates f at the new midpoints. Row k of the table is
+    accurate to O(h^(2k+2)) for smooth f. Stops when the diagonal changes
+    by at most tol (after at least min_levels levels, so a few coincident
+    samples of an oscillating f can't end it early).
+    
+    Returns the integral, the error estimate, the number of subintervals of
+    the finest trapezoid and the evaluation count.
+    """
+    previous_row = []
+    for level, (n, integral, evaluations) in enumerate(trapezoidal_refinements(f, a, b)):
+        row = [integral]
+        for j, previous in enumerate(previous_row, start=1):
+            row.append(row[j - 1] + (row[j - 1] - previous) / (4 ** j - 1))
+        if previous_row:
+            error = abs(row[-1] - previous_row[-1])
+            if (error <= tol and level >= min_levels) or level >= max_levels:
+                return row[-1], error, n, evaluations
+        previous_row = row
+
+def simpsons_rule(f, a, b, n):
+    """
+    Approximate the integral of f from a to b with composite Simpson's rule
+    on n subintervals (n must be even). Same arguments and return values as
+    trapezoidal_rule, with O(h^4) accuracy for the same n + 1 evaluations.
+    """
+    if n % 2:
+        raise ValueError("Simpson's rule needs an even number of subintervals")
+    h = (b - a) / n
+    x = np.linspace(a, b, n+1)
+    y = evaluate(f, x)
+    integral = h / 3 * (y[0] + 4 * np.sum(y[1:n:2]) + 2 * np.sum(y[2:n-1:2]) + y[n])
+    return integral, x, y
+
+def gauss_legendre(f, a, b, n, points=5):
+    """
+    Approximate the integral of f from a to b with composite Gauss-Legendre
+    quadrature: n equal subintervals with `points` nodes each, exact for
+    polynomials up to degree 2 * points - 1 on each subinterval. Returns the
+    integral and the x, y nodes like trapezoidal_rule (n * points
+    evaluations).
+    """
+    nodes, weights = np.polynomial.legendre.leggauss(points)
+    h = (b - a) / n
+    centers = a + h * (np.arange(n) + 0.5)
+    x = (centers[:, None] + 0.5 * h * nodes).ravel()
+    y = evaluate(f, x)
+    integral = 0.5 * h * np.sum(y.reshape(n, points) @ weights)
+    return integral, x, y
+
+def simpsons_rule_streaming(f, a, b, n, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Simpson's rule with memory independent of n; returns only the integral"""
+    if n % 2:
+        raise ValueError("Simpson's rule needs an even number of subintervals")
+    h = (b - a) / n
+    ends = evaluate(f, np.array([a, b], dtype=float))
+    odd = streaming_sum(f, a + h, 2 * h, n // 2, chunk_size)
+    even = streaming_sum(f, a + 2 * h, 2 * h, n // 2 - 1, chunk_size)
+    return h / 3 * math.fsum([ends[0], 4 * odd, 2 * even, ends[1]])
+
+def gauss_legendre_streaming(f, a, b, n, points=5, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Composite Gauss-Legendre with memory independent of n: node k of every
+    subinterval is summed with one streaming_sum pass. Returns only the
+    integral.
+    """
+    nodes, weights = np.polynomial.legendre.leggauss(points)
+    h = (b - a) / n
+    sums = [streaming_sum(f, a + 0.5 * h * (1 + node), h, n, chunk_size) for node in nodes]
+    return 0.5 * h * math.fsum(weight * total for weight, total in zip(weights, sums))
+
+def compare_rules(f, a, b, n, tol=1e-10):
+    """
+    Print the trapezoidal, Simpson, Gauss-Legendre and Romberg results with
+    their evaluation counts. The fixed-n rules are streamed, so this is safe
+    for the very large n that main streams too.
+    """
+    n_even = n + n % 2
+    rows = [(f"Trapezoidal (n = {n})", trapezoidal_rule_streaming(f, a, b, n), n + 1),
+            (f"Simpson (n = {n_even})", simpsons_rule_streaming(f, a, b, n_even), n_even + 1),
+            (f"Gauss-Legendre (n = {n}, 5 points)", gauss_legendre_streaming(f, a, b, n), 5 * n)]
+    integral, error, n_romberg, evaluations = romberg(f, a, b, tol)
+    rows.append((f"Romberg (tol = {tol:g}, n = {n_romberg})", integral, evaluations))
+    
+    for name, value, evaluations in rows:
+        print(f"{name:<40} {value:.12f}  ({evaluations} evaluations)")
+    return rows
+
+def adaptive_trapezoidal(f, a, b, tol=1e-6, max_rounds=50, min_intervals=16):
+    """
+    Adaptive trapezoidal rule. Each subinterval is scored by its local error
+    estimate |T2 - T1| / 3, comparing one trapezoid with two halves. While
+    the summed error exceeds tol, only the subintervals with the largest
+    errors are split (just enough of them that the rest fit within tol / 2);
+    the halves reuse the endpoint and midpoint values already computed, so
+    each split costs two new evaluations. Every round is one vectorized call.
+    It starts from min_intervals equal subintervals so that a few coincident
+    samples of an oscillating f can't make the first estimate look exact.
+    
+    Returns the integral, the estimated error, the evaluation count and the
+    sorted x points that were used.
+    """
+    edges = np.linspace(a, b, min_intervals + 1)
+    f_edges = evaluate(f, edges)
+    left, right = edges[:-1], edges[1:]
+    f_left, f_right = f_edges[:-1], f_edges[1:]
+    mid = 0.5 * (left + right)
+    f_mid = evaluate(f, mid)
+    evaluations = 2 * min_intervals + 1
+    nodes = [edges, mid]
+    
+    for _ in range(max_rounds):
+        width = right - left
+        fine = 0.25 * width * (f_left + 2 * f_mid + f_right)
+        local_error = np.abs(fine - 0.5 * width * (f_left + f_right)) / 3
+        error = np.sum(local_error)
+        if error <= tol:
+            break
+        
+        # Split the largest-error intervals until what is left over fits in tol / 2
+        order = np.argsort(local_error)[::-1]
+        remaining = error - np.cumsum(local_error[order])
+        split = order[:np.argmax(remaining <= tol / 2) + 1]
+        keep = np.ones(len(left), dtype=bool)
+        keep[split] = False
+        
+        new_left = np.concatenate([left[split], mid[split]])
+        new_right = np.concatenate([mid[split], right[split]])
+        new_mid = 0.5 * (new_left + new_right)
+        new_f_mid = evaluate(f, new_mid)
+        evaluations += len(new_mid)
+        nodes.append(new_mid)
+        
+        f_left = np.concatenate([f_left[keep], f_left[split], f_mid[split]])
+        f_right = np.concatenate([f_right[keep], f_mid[split], f_right[split]])
+        f_mid = np.concatenate([f_mid[keep], new_f_mid])
+        left = np.concatenate([left[keep], new_left])
+        right = np.concatenate([right[keep], new_right])
+        mid = np.concatenate([mid[keep], new_mid])
+    else:
+        width = right - left
+        fine = 0.25 * width * (f_left + 2 * f_mid + f_right)
+        error = np.sum(np.abs(fine - 0.5 * width * (f_left + f_right)) / 3)
+    
+    return float(np.sum(fine)), float(error), evaluations, np.unique(np.concatenate(nodes))
+
 def plot_trapezoidal(f, a, b, n, func_str):
     """Plot the function and the trapezoids used in the approximation"""
     integral, x, y = trapezoidal_rule(f, a, b, n)
@@ -128,24 +425,51 @@ def main():
     n = get_int_input("Enter the number of subintervals (n): ")
     
     # Compute the integral using the trapezoidal rule
-    integral, x, y = trapezoidal_rule(f, a, b, n)
-    
-    print(f"\nApproximation using {n} trapezoids: {integral:.6f}")
-    
-    # Plot the function and trapezoids
-    plot_trapezoidal(f, a, b, n, func_str)
+    if n > STREAMING_THRESHOLD:
+        # Too many points to keep in memory (or draw); stream them across all cores instead
+        integral = trapezoidal_rule_parallel(f, a, b, n)
+        print(f"\nApproximation using {n} trapezoids (streamed in parallel blocks): {integral:.6f}")
+    else:
+        integral, x, y = trapezoidal_rule(f, a, b, n)
+        
+        print(f"\nApproximation using {n} trapezoids: {integral:.6f}")
+        
+        # Plot the function and trapezoids
+        plot_trapezoidal(f, a, b, n, func_str)
     
     # Optional: Compare with different numbers of subintervals
     compare = input("\nWould you like to compare results with different numbers of subintervals? (y/n): ")
     if compare.lower() == 'y':
         print("\nError vs number of subintervals:")
-        subintervals = [n//2, n, n*2, n*4]
-        if n < 4:  # Add smaller values if n is small
-            subintervals = [2, 4, 8, 16]
+        if n < 4:
+            start, levels = 2, 4  # Start smaller if n is small
+        elif n % 2:
+            # n // 2 doesn't double to n, so evaluate it on its own
+            approx = trapezoidal_rule_streaming(f, a, b, n // 2)
+            print(f"n = {n // 2}: approximation = {approx:.6f} ({n // 2 + 1} evaluations)")
+            start, levels = n, 3
+        else:
+            start, levels = n // 2, 4
         
-        for n_test in subintervals:
-            approx, _, _ = trapezoidal_rule(f, a, b, n_test)
-            print(f"n = {n_test}: approximation = {approx:.6f}")
+        # Each doubling reuses the previous function values
+        refinements = trapezoidal_refinements(f, a, b, start)
+        for _ in range(levels):
+            n_test, approx, evaluations = next(refinements)
+            print(f"n = {n_test}: approximation = {approx:.6f} ({evaluations} evaluations so far)")
+    
+    adaptive = input("\nWould you like to integrate adaptively to a tolerance? (y/n): ")
+    if adaptive.lower() == 'y':
+        tol = get_float_input("Enter the tolerance (e.g., 1e-6): ")
+        integral, error, evaluations, _ = adaptive_trapezoidal(f, a, b, tol)
+        print(f"Adaptive: {integral:.10f} (estimated error {error:.2e}, {evaluations} evaluations)")
+        integral, error, n_uniform, evaluations = uniform_trapezoidal(f, a, b, tol)
+        print(f"Uniform:  {integral:.10f} (estimated error {error:.2e}, n = {n_uniform}, "
+              f"{evaluations} evaluations)")
+    
+    rules = input("\nWould you like to compare with Simpson's, Gauss-Legendre and Romberg integration? (y/n): ")
+    if rules.lower() == 'y':
+        print()
+        compare_rules(f, a, b, n)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,8 @@
+import SIS
+
+
+def test_import_stays_within_budget():
+    """`import SIS` must not pull in pandas, matplotlib or IPython, and must stay fast"""
+    report = SIS.benchmark_startup()
+    assert report['heavy_modules_loaded'] == []
+    assert report['within_budget']